@@ -0,0 +1,57 @@
+"""Check that parareal reproduces the serial time-stepping. Data and discretisation are specified in 'configs/global_configs.py'."""
+from firedrake import *
+import numpy as np
+
+from configs import global_configs as gcf
+from configs.experiment import taylor_hood_p3 as get_config
+from src.discretisation.space import get_space_discretisation_from_CONFIG
+from src.discretisation.time import TimeDiscretisation
+from src.algorithms.select import select_algorithm
+from src.algorithms.parareal import serial_deviation
+from src.noise import select_sampling
+from src.predefined_data import get_function
+
+#deviations are only caused by the tolerances of the solvers
+TOLERANCE: float = 1e-6
+#the time grid of this level is split into the chunks
+REFINEMENT_LEVEL: int = 4
+#parareal requires a one-step scheme, hence the algorithm of the global configs might not be applicable
+MODEL_NAME: str = "p-Stokes"
+ALGORITHM_NAME: str = "Implicit Euler mixed FEM linear multi Noise with sym Grad"
+
+def check(number_of_chunks: int) -> None:
+    """Compare parareal with 'number_of_chunks' chunks and the serial solution. Raise a ValueError if they deviate."""
+    cf = get_config()
+    space_disc = get_space_discretisation_from_CONFIG(name_mesh=gcf.MESH_NAME,
+                                                      space_resolution=gcf.SPACE_RESOLUTION,
+                                                      velocity_element=cf.VELOCITY_ELEMENT,
+                                                      velocity_degree=cf.VELOCITY_DEGREE,
+                                                      pressure_element=cf.PRESSURE_ELEMENT,
+                                                      pressure_degree=cf.PRESSURE_DEGREE,
+                                                      name_bc=gcf.NAME_BOUNDARY_CONDITION,
+                                                      comm=COMM_SELF
+                                                      )
+    time_disc = TimeDiscretisation(initial_time=gcf.INITIAL_TIME, end_time=gcf.END_TIME,refinement_levels=[REFINEMENT_LEVEL])
+    np.random.seed(0)
+    noise_steps = select_sampling(gcf.NOISE_INCREMENTS)([REFINEMENT_LEVEL],time_disc.initial_time,time_disc.end_time)[REFINEMENT_LEVEL]
+
+    deviation = serial_deviation(select_algorithm(MODEL_NAME,ALGORITHM_NAME),
+                                 space_disc=space_disc,
+                                 time_grid=time_disc.ref_to_time_grid[REFINEMENT_LEVEL],
+                                 noise_steps=noise_steps,
+                                 noise_coefficient=get_function(gcf.NOISE_COEFFICIENT_NAME,space_disc),
+                                 initial_condition=get_function(gcf.INITIAL_CONDITION_NAME,space_disc),
+                                 number_of_chunks=number_of_chunks,
+                                 p_value=cf.P_VALUE,
+                                 kappa_value=gcf.KAPPA_VALUE,
+                                 noise_intensity=gcf.NOISE_INTENSITY)
+    if not deviation < TOLERANCE:
+        msg = "Parareal does not reproduce the serial solution."
+        msg += f"\nNumber of chunks:\t {number_of_chunks}"
+        msg += f"\nDeviation:\t {deviation}"
+        raise ValueError(msg)
+    print(f"Parareal with {number_of_chunks} chunks reproduces the serial solution, deviation:\t {deviation}")
+
+if __name__ == "__main__":
+    for number_of_chunks in [1, 4]:
+        check(number_of_chunks)
@@ -16,6 +16,12 @@ PRESSURE_DEGREE: int = 1
 #Log
 NAME_LOGFILE_GENERATE: str = f"{NAME_EXPERIMENT}.log"
 
+#Profile
+NAME_PROFILE_GENERATE: str = f"{NAME_EXPERIMENT}.prof"
+
+#Checkpoint
+NAME_CHECKPOINT_GENERATE: str = f"{NAME_EXPERIMENT}.ckpt"
+
 #Vtk
 VTK_DIRECTORY: str = f"vtk"
 
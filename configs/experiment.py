@@ -0,0 +1,70 @@
+"""Contains local parameter configurations as immutable objects."""
+from dataclasses import dataclass
+from types import ModuleType
+
+from configs import TaylorHood_p3, TaylorHood_p1_5, ScottVogelius_p3, ScottVogelius_p1_5
+
+@dataclass(slots=True, frozen=True)
+class ExperimentConfig:
+    """Store local parameter configuration.
+
+    File and directory names are derived from the experiment name. Hence, several experiments can be run in one process, e.g. by 'dataclasses.replace'."""
+    NAME_EXPERIMENT: str
+    P_VALUE: float
+    VELOCITY_ELEMENT: str
+    VELOCITY_DEGREE: int
+    PRESSURE_ELEMENT: str
+    PRESSURE_DEGREE: int
+    VTK_DIRECTORY: str = "vtk"
+
+    ################               FILE/DIRECTORY NAMES               ############################
+    @property
+    def NAME_LOGFILE_GENERATE(self) -> str:
+        return f"{self.NAME_EXPERIMENT}.log"
+
+    @property
+    def NAME_PROFILE_GENERATE(self) -> str:
+        return f"{self.NAME_EXPERIMENT}.prof"
+
+    @property
+    def NAME_CHECKPOINT_GENERATE(self) -> str:
+        return f"{self.NAME_EXPERIMENT}.ckpt"
+
+    @property
+    def TIME_DIRECTORYNAME(self) -> str:
+        return f"convergence_results/{self.NAME_EXPERIMENT}"
+
+    @property
+    def STABILITY_DIRECTORYNAME(self) -> str:
+        return f"stability_results/{self.NAME_EXPERIMENT}"
+
+    @property
+    def ENERGY_DIRECTORYNAME(self) -> str:
+        return f"energy_results/{self.NAME_EXPERIMENT}"
+
+    @property
+    def STATISTICS_DIRECTORYNAME(self) -> str:
+        return f"statistic_results/{self.NAME_EXPERIMENT}"
+
+def config_from_module(module: ModuleType) -> ExperimentConfig:
+    """Return configuration that is specified by the constants of a config module."""
+    return ExperimentConfig(NAME_EXPERIMENT=module.NAME_EXPERIMENT,
+                            P_VALUE=module.P_VALUE,
+                            VELOCITY_ELEMENT=module.VELOCITY_ELEMENT,
+                            VELOCITY_DEGREE=module.VELOCITY_DEGREE,
+                            PRESSURE_ELEMENT=module.PRESSURE_ELEMENT,
+                            PRESSURE_DEGREE=module.PRESSURE_DEGREE,
+                            VTK_DIRECTORY=module.VTK_DIRECTORY)
+
+### factories of predefined experiments
+def taylor_hood_p3() -> ExperimentConfig:
+    return config_from_module(TaylorHood_p3)
+
+def taylor_hood_p1_5() -> ExperimentConfig:
+    return config_from_module(TaylorHood_p1_5)
+
+def scott_vogelius_p3() -> ExperimentConfig:
+    return config_from_module(ScottVogelius_p3)
+
+def scott_vogelius_p1_5() -> ExperimentConfig:
+    return config_from_module(ScottVogelius_p1_5)
@@ -2,6 +2,21 @@
 ################               GLOBAL configs               ############################
 LOG_LEVEL: str = "info"  #supported levels: debug, info, warning, error, critical 
 
+### Profiling of Monte Carlo iteration with cProfile
+PROFILE: bool = False
+
+### Checkpoint of Monte Carlo iteration, the processed data is stored every CHECKPOINT_EVERY samples; 0 disables checkpoints
+CHECKPOINT_EVERY: int = 50
+
+### Warmup, the algorithm is run for a single step before the Monte Carlo iteration to compile all kernels ahead of time
+WARMUP: bool = False
+
+### Disk cache of the generated kernels, set it to a directory that is shared by all ranks; the empty string keeps the firedrake defaults
+KERNEL_CACHE_DIRECTORY: str = ""
+
+### Native compilation of the generated kernels with '-march=native -ffast-math'; the kernels are then tuned to the host and not portable to other machines
+NATIVE_KERNELS: bool = False
+
 ### Dump-location
 DUMP_LOCATION: str = "sample_dump"
 
@@ -12,6 +27,7 @@ KAPPA_VALUE: float = 0.1
 
 ### Algorithm
 ALGORITHM_NAME: str =  "Implicit Euler mixed FEM linear multi Noise with sym Grad and approx of Averages" #see src.algorithms.select.py for available choices
+SOLVER_NAME: str = "default"    #see 'src.algorithms.solver_configs' for available choices
 
 ### Data
 INITIAL_CONDITION_NAME: str = "polynomial"    #see 'src.predefined_data' for available choices
@@ -1,14 +1,27 @@
 """Generate samples with configuration specified in 'config.py'."""
+import os
+from configs import global_configs as gcf
+#the compiler flags of the generated kernels are read when firedrake is imported
+if gcf.NATIVE_KERNELS:
+    os.environ.setdefault("PYOP2_CFLAGS","-march=native -ffast-math")
+#the disk caches of the generated kernels are read when firedrake is imported; a shared directory lets all ranks and later runs reuse the compiled kernels
+if gcf.KERNEL_CACHE_DIRECTORY:
+    os.environ.setdefault("PYOP2_CACHE_DIR",os.path.join(gcf.KERNEL_CACHE_DIRECTORY,"pyop2"))
+    os.environ.setdefault("FIREDRAKE_TSFC_KERNEL_CACHE_DIR",os.path.join(gcf.KERNEL_CACHE_DIRECTORY,"tsfc"))
 from firedrake import *
 import numpy as np
 import logging
-from time import process_time_ns
+from time import perf_counter_ns
+import cProfile
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 from src.discretisation.space import get_space_discretisation_from_CONFIG, SpaceDiscretisation
 from src.discretisation.time import TimeDiscretisation
 from src.data_dump.setup import  update_logfile
-from src.algorithms.select import Algorithm, select_algorithm
+from src.data_dump.checkpoint import save_checkpoint, load_checkpoint, remove_checkpoint
+from src.algorithms.select import Algorithm, select_algorithm, warmup_algorithm
+from src.algorithms.solver_configs import get_solver_parameters
 from src.noise import SamplingStrategy, select_sampling
 from src.predefined_data import get_function
 from src.string_formatting import format_runtime, format_header
@@ -23,11 +36,11 @@ from src.postprocess.time_convergence import TimeComparison
 from src.postprocess.stability_check import StabilityCheck
 from src.postprocess.energy_check import Energy
 from src.postprocess.statistics import StatisticsObject
+from src.solution_trace import SolutionTrace
 from src.postprocess.processmanager import ProcessManager
 
 #load global and lokal configs
-from configs import TaylorHood_p3 as cf
-from configs import global_configs as gcf
+from configs.experiment import ExperimentConfig, taylor_hood_p3 as get_config
 
 def generate_one(time_disc: TimeDiscretisation,
                  space_disc: SpaceDiscretisation,
@@ -37,7 +50,8 @@ def generate_one(time_disc: TimeDiscretisation,
                  kappa_value: float,
                  noise_intensity: float,
                  algorithm: Algorithm,
-                 sampling_strategy: SamplingStrategy) -> tuple[dict[int,list[float]], dict[int,dict[float,Function]], dict[int,dict[float,Function]]]:
+                 sampling_strategy: SamplingStrategy,
+                 solver_parameters: dict | None = None) -> tuple[dict[int,list[float]], dict[int,dict[float,Function]], dict[int,dict[float,Function]]]:
     """Run the numerical experiment once. 
     
     Return noise and solution."""
@@ -56,18 +70,24 @@ def generate_one(time_disc: TimeDiscretisation,
             Reynolds_number=1,
             p_value=p_value,
             kappa_value=kappa_value,
-            noise_intensity=noise_intensity
+            noise_intensity=noise_intensity,
+            solver_parameters=solver_parameters
             )
     return ref_to_noise_increments, ref_to_time_to_velocity, ref_to_time_to_pressure
 
 
-def generate() -> None:
-    """Runs the experiment multiple times."""
+def generate(cf: ExperimentConfig) -> None:
+    """Runs the experiment specified by 'cf' multiple times."""
 
-    update_logfile(gcf.DUMP_LOCATION,cf.NAME_LOGFILE_GENERATE)
+    #Monte Carlo samples are distributed among all ranks, each rank solves on its own copy of the mesh 
+    comm = COMM_WORLD
 
-    logging.basicConfig(filename=cf.NAME_LOGFILE_GENERATE,format='%(asctime)s| \t %(message)s', datefmt='%d/%m/%Y %I:%M:%S %p', 
-                        level=logstring_to_logger(gcf.LOG_LEVEL),force=True)
+    if comm.rank == 0:
+        update_logfile(gcf.DUMP_LOCATION,cf.NAME_LOGFILE_GENERATE)
+        logging.basicConfig(filename=cf.NAME_LOGFILE_GENERATE,format='%(asctime)s| \t %(message)s', datefmt='%d/%m/%Y %I:%M:%S %p', 
+                            level=logstring_to_logger(gcf.LOG_LEVEL),force=True)
+    else:
+        logging.basicConfig(format=f'rank {comm.rank}| \t %(message)s',level=logging.WARNING,force=True)
 
 
     # define discretisation
@@ -77,7 +97,8 @@ def generate() -> None:
                                                       velocity_degree=cf.VELOCITY_DEGREE,
                                                       pressure_element=cf.PRESSURE_ELEMENT,
                                                       pressure_degree=cf.PRESSURE_DEGREE,
-                                                      name_bc=gcf.NAME_BOUNDARY_CONDITION
+                                                      name_bc=gcf.NAME_BOUNDARY_CONDITION,
+                                                      comm=COMM_SELF
                                                       )
     logging.info(space_disc)
 
@@ -90,6 +111,8 @@ def generate() -> None:
 
     # select algorithm
     algorithm = select_algorithm(gcf.MODEL_NAME,gcf.ALGORITHM_NAME)
+    #tolerances that depend on the time step are set by the finest step, hence coarser levels are solved at least as accurately
+    solver_parameters = get_solver_parameters(gcf.SOLVER_NAME,time_stepsize=min(time_disc.ref_to_time_stepsize.values()))
 
     #select sampling
     sampling_strategy = select_sampling(gcf.NOISE_INCREMENTS)
@@ -123,79 +146,176 @@ def generate() -> None:
         statistics_velocity = StatisticsObject("velocity",time_disc.ref_to_time_grid,space_disc.velocity_space)
         statistics_pressure = StatisticsObject("pressure",time_disc.ref_to_time_grid,space_disc.pressure_space)
 
+    #collect processed data that is stored in checkpoints
+    processes = []
+    if gcf.TIME_CONVERGENCE:
+        processes += [time_convergence_velocity, time_convergence_pressure]
+    if gcf.STABILITY_CHECK:
+        processes += [stability_check_velocity, stability_check_pressure]
+    if gcf.ENERGY_CHECK:
+        processes += [energy_check_velocity]
+    if gcf.STATISTICS_CHECK:
+        processes += [statistics_velocity, statistics_pressure]
+
+    #resume from checkpoint of an interrupted run; each rank stores its own checkpoint
+    name_checkpoint = cf.NAME_CHECKPOINT_GENERATE if comm.size == 1 else f"{cf.NAME_CHECKPOINT_GENERATE}.rank_{comm.rank}"
+    checkpoint_header = {"MC samples": gcf.MC_SAMPLES, "ranks": comm.size, "algorithm": gcf.ALGORITHM_NAME, 
+                         "refinement levels": gcf.REFINEMENT_LEVELS, "processes": [gcf.TIME_CONVERGENCE, gcf.STABILITY_CHECK, gcf.ENERGY_CHECK, gcf.STATISTICS_CHECK]}
+    start_index = 0
+    checkpoint = load_checkpoint(name_checkpoint)
+    if checkpoint is not None:
+        if checkpoint["header"] == checkpoint_header:
+            for process, state in zip(processes,checkpoint["states"]):
+                process.load_state_dict(state)
+            start_index = checkpoint["completed"]
+            logging.info(format_header("CHECKPOINT") + f"\nResume from:\t {name_checkpoint}\nCompleted samples:\t {start_index}")
+        else:
+            print(f"rank {comm.rank}: checkpoint '{name_checkpoint}' does not match the configuration and is ignored.")
+
+
+    #kernels are compiled before the Monte Carlo iteration; they are cached on disk and reused by later runs
+    #rank 0 compiles first, afterwards the other ranks load the kernels from the disk cache instead of compiling the same kernels concurrently
+    if gcf.WARMUP:
+        time_mark = perf_counter_ns()
+        warmup = partial(warmup_algorithm,algorithm,space_disc=space_disc,noise_coefficient=noise_coefficient,initial_condition=initial_condition,Reynolds_number=1,
+                         p_value=cf.P_VALUE,kappa_value=gcf.KAPPA_VALUE,noise_intensity=gcf.NOISE_INTENSITY,solver_parameters=solver_parameters)
+        if comm.rank == 0:
+            warmup()
+        comm.barrier()
+        if not comm.rank == 0:
+            warmup()
+        logging.info(format_header("WARMUP") + f"\nCompilation time:\t {(perf_counter_ns() - time_mark)/1e9:.2f}s")
     
-    runtimes = {"solving": 0,"comparison": 0, "stability": 0, "energy": 0, "statistics": 0}
-    
-    ### start MC iteration
-    print(format_header("START MONTE CARLO ITERATION") + f"\nRequested samples:\t{gcf.MC_SAMPLES}")
-    new_seeds = range(gcf.MC_SAMPLES)
+    #profiling is optional, since it slows down every python call in the Monte Carlo iteration
+    if gcf.PROFILE:
+        profiler = cProfile.Profile()
+        profiler.enable()
 
-    for k in new_seeds:
+    #run times of the phases of the Monte Carlo iteration in nanoseconds, indexed by phase
+    RUNTIME_NAMES = ("solving", "comparison", "stability", "energy", "statistics")
+    SOLVING, COMPARISON, STABILITY, ENERGY, STATISTICS = range(len(RUNTIME_NAMES))
+    runtimes = np.zeros(len(RUNTIME_NAMES),dtype=np.int64)
+
+    ### start MC iteration
+    if comm.rank == 0:
+        print(format_header("START MONTE CARLO ITERATION") + f"\nRequested samples:\t{gcf.MC_SAMPLES}\nNumber of ranks:\t{comm.size}")
+    new_seeds = range(comm.rank,gcf.MC_SAMPLES,comm.size)
+    number_of_seeds = len(new_seeds)
+    #progress is reported at every percent of the samples of this rank
+    progress_every = max(1,number_of_seeds//100)
+    fine_level = time_disc.refinement_levels[-1]
+
+    for index, k in enumerate(new_seeds[start_index:],start=start_index):
         ### get solution
-        print(f"{k*100/len(new_seeds):4.2f}% completed")
-        time_mark = process_time_ns()
-        ref_to_noise_increments, ref_to_time_to_velocity, ref_to_time_to_pressure = generate_one(time_disc,space_disc,initial_condition,noise_coefficient,cf.P_VALUE,gcf.KAPPA_VALUE,gcf.NOISE_INTENSITY,algorithm,sampling_strategy)
-        runtimes["solving"] += process_time_ns()-time_mark
+        if index % progress_every == 0:
+            print(f"rank {comm.rank}: {index*100/number_of_seeds:4.2f}% completed")
+        #the seed only depends on the global sample index, which makes samples independent of the number of ranks
+        np.random.seed(k)
+        time_mark = perf_counter_ns()
+        ref_to_noise_increments, ref_to_time_to_velocity, ref_to_time_to_pressure = generate_one(time_disc,space_disc,initial_condition,noise_coefficient,cf.P_VALUE,gcf.KAPPA_VALUE,gcf.NOISE_INTENSITY,algorithm,sampling_strategy,solver_parameters)
+        runtimes[SOLVING] += perf_counter_ns() - time_mark
 
         #update data using solution
         if gcf.TIME_CONVERGENCE:
-            time_mark = process_time_ns()
-            time_to_fine_velocity = ref_to_time_to_velocity[time_disc.refinement_levels[-1]]
+            time_mark = perf_counter_ns()
+            time_to_fine_velocity = ref_to_time_to_velocity[fine_level]
             time_convergence_velocity.update(ref_to_time_to_velocity,time_to_fine_velocity)
-            time_to_fine_pressure = ref_to_time_to_pressure[time_disc.refinement_levels[-1]]
+            time_to_fine_pressure = ref_to_time_to_pressure[fine_level]
             time_convergence_pressure.update(ref_to_time_to_pressure,time_to_fine_pressure)
-            runtimes["comparison"] += process_time_ns()-time_mark
+            runtimes[COMPARISON] += perf_counter_ns() - time_mark
 
         if gcf.STABILITY_CHECK:
-            time_mark = process_time_ns()
+            time_mark = perf_counter_ns()
             stability_check_velocity.update(ref_to_time_to_velocity)
             stability_check_pressure.update(ref_to_time_to_pressure)
-            runtimes["stability"] += process_time_ns()-time_mark
+            runtimes[STABILITY] += perf_counter_ns() - time_mark
 
         if gcf.ENERGY_CHECK:
-            time_mark = process_time_ns()
+            time_mark = perf_counter_ns()
             energy_check_velocity.update(ref_to_time_to_velocity,ref_to_noise_increments)
-            runtimes["energy"] += process_time_ns()-time_mark
+            runtimes[ENERGY] += perf_counter_ns() - time_mark
 
         if gcf.STATISTICS_CHECK:
-            time_mark = process_time_ns()
-            statistics_velocity.update(ref_to_time_to_velocity)
-            statistics_pressure.update(ref_to_time_to_pressure)
-            runtimes["statistics"] += process_time_ns()-time_mark
+            time_mark = perf_counter_ns()
+            statistics_velocity.update(SolutionTrace.from_ref_to_time_to_function(ref_to_time_to_velocity))
+            statistics_pressure.update(SolutionTrace.from_ref_to_time_to_function(ref_to_time_to_pressure))
+            runtimes[STATISTICS] += perf_counter_ns() - time_mark
+
+        #store processed data
+        if gcf.CHECKPOINT_EVERY and (index + 1) % gcf.CHECKPOINT_EVERY == 0:
+            save_checkpoint(name_checkpoint,{"header": checkpoint_header, "completed": index + 1, "states": [process.state_dict() for process in processes]})
+
+    if gcf.PROFILE:
+        profiler.disable()
+        profiler.dump_stats(cf.NAME_PROFILE_GENERATE if comm.size == 1 else f"{cf.NAME_PROFILE_GENERATE}.rank_{comm.rank}")
 
+    ### collecting processed data of all ranks
+    if gcf.TIME_CONVERGENCE:
+        time_convergence_velocity.reduce(comm)
+        time_convergence_pressure.reduce(comm)
+
+    if gcf.STABILITY_CHECK:
+        stability_check_velocity.reduce(comm)
+        stability_check_pressure.reduce(comm)
+
+    if gcf.ENERGY_CHECK:
+        energy_check_velocity.reduce(comm)
+
+    if gcf.STATISTICS_CHECK:
+        statistics_velocity.reduce(comm)
+        statistics_pressure.reduce(comm)
+
+    #the other ranks wait until rank 0 has saved the results; if saving fails, all checkpoints are kept and the run can be resumed
+    if not comm.rank == 0:
+        comm.barrier()
+        remove_checkpoint(name_checkpoint)
+        return
     
     ### storing processed data 
-    if gcf.TIME_CONVERGENCE:
-        logging.info(format_header("TIME CONVERGENCE") + f"\nComparisons are stored in:\t {cf.TIME_DIRECTORYNAME}/")
-        logging.info(time_convergence_velocity)
-        logging.info(time_convergence_pressure)
+    #csv files are written by background threads while plots and vtk files are generated; firedrake and pyplot stay on the main thread
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        csv_saves = []
+        if gcf.TIME_CONVERGENCE:
+            logging.info(format_header("TIME CONVERGENCE") + f"\nComparisons are stored in:\t {cf.TIME_DIRECTORYNAME}/")
+            logging.info(time_convergence_velocity)
+            logging.info(time_convergence_pressure)
 
-        time_convergence_velocity.save(cf.TIME_DIRECTORYNAME)
-        time_convergence_pressure.save(cf.TIME_DIRECTORYNAME)
+            csv_saves.append(executor.submit(time_convergence_velocity.save,cf.TIME_DIRECTORYNAME))
+            csv_saves.append(executor.submit(time_convergence_pressure.save,cf.TIME_DIRECTORYNAME))
 
-    if gcf.STABILITY_CHECK:
-        logging.info(format_header("STABILITY CHECK") + f"\nStability checks are stored in:\t {cf.STABILITY_DIRECTORYNAME}/")
-        logging.info(stability_check_velocity)
-        logging.info(stability_check_pressure)
+        if gcf.STABILITY_CHECK:
+            logging.info(format_header("STABILITY CHECK") + f"\nStability checks are stored in:\t {cf.STABILITY_DIRECTORYNAME}/")
+            logging.info(stability_check_velocity)
+            logging.info(stability_check_pressure)
 
-        stability_check_velocity.save(cf.STABILITY_DIRECTORYNAME)
-        stability_check_pressure.save(cf.STABILITY_DIRECTORYNAME)
+            csv_saves.append(executor.submit(stability_check_velocity.save,cf.STABILITY_DIRECTORYNAME))
+            csv_saves.append(executor.submit(stability_check_pressure.save,cf.STABILITY_DIRECTORYNAME))
 
-    if gcf.ENERGY_CHECK:
-        logging.info(format_header("ENERGY CHECK") + f"\nEnergy checks are stored in:\t {cf.ENERGY_DIRECTORYNAME}/")
-        energy_check_velocity.save(cf.ENERGY_DIRECTORYNAME)
-        energy_check_velocity.plot(cf.ENERGY_DIRECTORYNAME)
-        energy_check_velocity.plot_individual(cf.ENERGY_DIRECTORYNAME)
+        if gcf.ENERGY_CHECK:
+            logging.info(format_header("ENERGY CHECK") + f"\nEnergy checks are stored in:\t {cf.ENERGY_DIRECTORYNAME}/")
+            csv_saves.append(executor.submit(energy_check_velocity.save,cf.ENERGY_DIRECTORYNAME))
+            energy_check_velocity.plot(cf.ENERGY_DIRECTORYNAME)
+            energy_check_velocity.plot_individual(cf.ENERGY_DIRECTORYNAME)
 
 
-    if gcf.STATISTICS_CHECK:
-        logging.info(format_header("STATISTICS") + f"\nStatistics are stored in:\t {cf.VTK_DIRECTORY + '/' + cf.STATISTICS_DIRECTORYNAME}/")
-        statistics_velocity.save(cf.VTK_DIRECTORY + "/" + cf.STATISTICS_DIRECTORYNAME)
-        statistics_pressure.save(cf.VTK_DIRECTORY + "/" + cf.STATISTICS_DIRECTORYNAME)
+        if gcf.STATISTICS_CHECK:
+            logging.info(format_header("STATISTICS") + f"\nStatistics are stored in:\t {cf.VTK_DIRECTORY + '/' + cf.STATISTICS_DIRECTORYNAME}/")
+            statistics_velocity.save(cf.VTK_DIRECTORY + "/" + cf.STATISTICS_DIRECTORYNAME)
+            statistics_pressure.save(cf.VTK_DIRECTORY + "/" + cf.STATISTICS_DIRECTORYNAME)
+
+        #raise exceptions of the background threads
+        for csv_save in csv_saves:
+            csv_save.result()
 
     #show runtimes
-    logging.info(format_runtime(runtimes))
+    logging.info(format_runtime(dict(zip(RUNTIME_NAMES,runtimes.tolist()))))
     print(f"Logs saved in:\t {cf.NAME_LOGFILE_GENERATE}")
+    if gcf.PROFILE:
+        print(f"Profiles saved in:\t {cf.NAME_PROFILE_GENERATE}")
+
+    #the run is complete and does not need to be resumed; the other ranks remove their checkpoints after this barrier
+    comm.barrier()
+    remove_checkpoint(name_checkpoint)
 
 if __name__ == "__main__":
-    generate()
\ No newline at end of file
+    generate(get_config())
\ No newline at end of file
@@ -5,12 +5,29 @@ from firedrake import *
 def epsilon(grad_u):
     return 0.5*(grad_u + grad_u.T)
 
+### powers with specialised exponents
+def _power(base, exponent: float):
+    """Return base**exponent. 
+    
+    Integer, half-integer and quarter-integer exponents are expressed by products and square roots, which compile to cheaper kernels than a general power."""
+    if not isinstance(exponent, (int, float)):
+        return base**exponent
+    if exponent == 0:
+        return 1.0
+    for roots, scaling in enumerate([1, 2, 4]):
+        if float(scaling*exponent).is_integer():
+            root = base
+            for _ in range(roots):
+                root = sqrt(root)
+            return root**int(scaling*exponent)
+    return base**exponent
+
 ### monotone operators
 def S_tensor(grad_u, p_value: float = 2.0, kappa_value: float = 0.1):
-    return ( kappa_value + inner(grad_u,grad_u) )**( (p_value - 2.0)/2.0 )*grad_u
+    return _power( kappa_value + inner(grad_u,grad_u), (p_value - 2.0)/2.0 )*grad_u
 
 def V_tensor(grad_u, p_value: float = 2.0, kappa_value: float = 0.1):
-    return ( kappa_value + inner(grad_u,grad_u) )**( (p_value - 2.0)/4.0 )*grad_u
+    return _power( kappa_value + inner(grad_u,grad_u), (p_value - 2.0)/4.0 )*grad_u
 
 def S_tensor_sym(grad_u, p_value: float = 2.0, kappa_value: float = 0.1):
     return S_tensor(epsilon(grad_u),p_value,kappa_value)
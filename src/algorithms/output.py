@@ -0,0 +1,169 @@
+"""Contains handlers that store the solutions computed by the time-stepping."""
+from firedrake import Function, FunctionSpace, CheckpointFile
+from collections.abc import Mapping
+from dataclasses import dataclass
+import os
+import numpy as np
+from typing import TypeAlias, Iterator
+
+from src.discretisation.space import SpaceDiscretisation
+from src.math.vector_operations import copy
+
+class DictOutput:
+    """Store the solutions in memory as 'time -> velocity' and 'time -> pressure' dictionaries.
+
+    The functions of all nodal times are allocated at once and filled by copying the dofs."""
+    def initialise(self, space_disc: SpaceDiscretisation, nodal_times: list[float]) -> None:
+        """Allocate the storage of a new trajectory."""
+        self.velocity_storage = [Function(space_disc.velocity_space) for _ in nodal_times]
+        self.pressure_storage = [Function(space_disc.pressure_space) for _ in nodal_times]
+        self.time_to_velocity = dict()
+        self.time_to_pressure = dict()
+
+    def store(self, index: int, time: float, velocity: Function, pressure: Function) -> None:
+        """Store the solution at the nodal time with number 'index'."""
+        self.time_to_velocity[time] = self.velocity_storage[index].assign(velocity)
+        self.time_to_pressure[time] = self.pressure_storage[index].assign(pressure)
+
+    def result(self) -> tuple[dict[float,Function],dict[float,Function]]:
+        """Return 'time -> velocity' and 'time -> pressure' dictionaries."""
+        return self.time_to_velocity, self.time_to_pressure
+
+
+@dataclass
+class FunctionTrajectory:
+    """Functions at all nodal times stored in time order. The nodal times are stored in 'times' and the function at 'times[index]' in 'functions[index]'."""
+    times: np.ndarray
+    functions: list[Function]
+
+    def to_dict(self) -> dict[float,Function]:
+        """Return 'time -> function' dictionary of the trajectory."""
+        return dict(zip(self.times.tolist(),self.functions))
+
+
+class ListOutput:
+    """Store the solutions in memory as lists of functions in time order, which avoids hashing of float keys.
+
+    The functions of all nodal times are allocated at once and filled by copying the dofs."""
+    def initialise(self, space_disc: SpaceDiscretisation, nodal_times: list[float]) -> None:
+        """Allocate the storage of a new trajectory."""
+        self.times = np.asarray(nodal_times,dtype=np.float64)
+        self.velocities = [Function(space_disc.velocity_space) for _ in nodal_times]
+        self.pressures = [Function(space_disc.pressure_space) for _ in nodal_times]
+
+    def store(self, index: int, time: float, velocity: Function, pressure: Function) -> None:
+        """Store the solution at the nodal time with number 'index'."""
+        copy(self.velocities[index],velocity)
+        copy(self.pressures[index],pressure)
+
+    def result(self) -> tuple[FunctionTrajectory,FunctionTrajectory]:
+        """Return the velocity and pressure trajectories."""
+        return FunctionTrajectory(self.times,self.velocities), FunctionTrajectory(self.times,self.pressures)
+
+
+@dataclass
+class ArrayTrajectory:
+    """Degrees of freedom of a function at all nodal times stored as struct of arrays.
+
+    The nodal times are stored in 'times' and the degrees of freedom in 'values', an array of shape (number of times, shape of dofs)."""
+    times: np.ndarray
+    values: np.ndarray
+
+
+class ArrayOutput:
+    """Store the degrees of freedom of the solutions in two preallocated arrays, which allows vectorised post-processing over all times.
+
+    The solve is always carried out in double precision. The stored dofs are cast to 'dtype', e.g. np.float32 halves the memory of a trajectory."""
+    def __init__(self, dtype: np.dtype = np.float64):
+        self.dtype = np.dtype(dtype)
+        if not np.issubdtype(self.dtype,np.floating):
+            msg = "Trajectories can only be stored in floating point types."
+            msg += f"\nRequested type:\t {self.dtype}"
+            raise ValueError(msg)
+
+    def initialise(self, space_disc: SpaceDiscretisation, nodal_times: list[float]) -> None:
+        """Allocate the arrays of a new trajectory."""
+        self.times = np.asarray(nodal_times,dtype=np.float64)
+        self.velocity = np.empty((len(nodal_times),*Function(space_disc.velocity_space).dat.data_ro.shape),dtype=self.dtype)
+        self.pressure = np.empty((len(nodal_times),*Function(space_disc.pressure_space).dat.data_ro.shape),dtype=self.dtype)
+
+    def store(self, index: int, time: float, velocity: Function, pressure: Function) -> None:
+        """Copy the degrees of freedom of the solution at the nodal time with number 'index'. The cast to the storage type happens during the copy."""
+        self.velocity[index] = velocity.dat.data_ro
+        self.pressure[index] = pressure.dat.data_ro
+
+    def result(self) -> tuple[ArrayTrajectory,ArrayTrajectory]:
+        """Return the velocity and pressure trajectories."""
+        return ArrayTrajectory(self.times,self.velocity), ArrayTrajectory(self.times,self.pressure)
+
+
+class CheckpointTrajectory(Mapping):
+    """Read-only 'time -> function' mapping of a function stored in a checkpoint file. Each access loads the function from the open file.
+
+    The functions are loaded onto the mesh they were computed on and returned in 'function_space'. Hence, they are compatible with the space discretisation of the run."""
+    def __init__(self, file: CheckpointFile, function_space: FunctionSpace, name_function: str, time_to_index: dict[float,int]):
+        self.file = file
+        self.function_space = function_space
+        self.name_function = name_function
+        self.time_to_index = time_to_index
+
+    def __getitem__(self, time: float) -> Function:
+        index = self.time_to_index[time]
+        loaded = self.file.load_function(self.function_space.mesh(), self.name_function, idx=index)
+        #the loaded function lives on an equivalent but new function space; its dofs are copied to keep the function space of the run
+        function = Function(self.function_space)
+        copy(function,loaded)
+        return function
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.time_to_index)
+
+    def __len__(self) -> int:
+        return len(self.time_to_index)
+
+    def close(self) -> None:
+        """Close the checkpoint file. It is shared by the velocity and pressure trajectory, hence both are closed."""
+        self.file.close()
+
+
+class CheckpointOutput:
+    """Stream the solutions into a checkpoint file. Only a single velocity and pressure are kept in memory.
+
+    If several trajectories are computed in parallel, e.g. Monte Carlo samples on different ranks, each needs its own file.
+    The handler can be reused for several trajectories, e.g. all refinement levels. Each trajectory is written to its own file 'name_file' with the number of the trajectory as suffix,
+    hence mappings of earlier trajectories stay valid."""
+    def __init__(self, name_file: str):
+        self.name_file = name_file
+        self.trajectories = 0
+
+    def initialise(self, space_disc: SpaceDiscretisation, nodal_times: list[float]) -> None:
+        """Open the file of a new trajectory and store the mesh."""
+        root, extension = os.path.splitext(self.name_file)
+        self.name_trajectory_file = f"{root}_{self.trajectories}{extension}"
+        self.trajectories += 1
+        self.space_disc = space_disc
+        self.velocity = Function(space_disc.velocity_space, name="velocity")
+        self.pressure = Function(space_disc.pressure_space, name="pressure")
+        self.time_to_index = dict()
+        self.file = CheckpointFile(self.name_trajectory_file, "w", comm=space_disc.mesh.comm)
+        self.file.save_mesh(space_disc.mesh)
+
+    def store(self, index: int, time: float, velocity: Function, pressure: Function) -> None:
+        """Append the solution at the nodal time with number 'index' to the file."""
+        copy(self.velocity,velocity)
+        copy(self.pressure,pressure)
+        self.file.save_function(self.velocity, idx=index)
+        self.file.save_function(self.pressure, idx=index)
+        self.time_to_index[time] = index
+
+    def result(self) -> tuple[CheckpointTrajectory,CheckpointTrajectory]:
+        """Close the written file and return 'time -> velocity' and 'time -> pressure' mappings that load from the file. 
+        
+        The written file is closed before it is reopened once for reading; the reader is shared by both mappings and released by their 'close' method."""
+        self.file.close()
+        file = CheckpointFile(self.name_trajectory_file, "r", comm=self.space_disc.mesh.comm)
+        return (CheckpointTrajectory(file, self.space_disc.velocity_space, "velocity", self.time_to_index),
+                CheckpointTrajectory(file, self.space_disc.pressure_space, "pressure", self.time_to_index))
+
+### abstract structure of an output handler
+OutputHandler: TypeAlias = DictOutput | ListOutput | ArrayOutput | CheckpointOutput
@@ -1,15 +1,20 @@
 from firedrake import *
-from copy import deepcopy
+import numpy as np
 from tqdm import tqdm
 from typing import TypeAlias, Callable, Optional
 import logging
 
-from src.discretisation.time import trajectory_to_incremets
+from src.discretisation.time import validate_increments
 from src.discretisation.space import SpaceDiscretisation
+from src.discretisation.projections import remove_mean_value
+from src.math.vector_operations import copy, average
+from src.algorithms.output import OutputHandler, DictOutput
 from src.algorithms.nonlinearities import S_tensor, S_tensor_sym, epsilon
-from src.algorithms.solver_configs import enable_monitoring, direct_solve_details
+from src.algorithms.solver_configs import enable_monitoring, direct_solve_details, spectral_form_compiler
 
 ### abstract structure of a p-Stokes algorithm
+#each algorithm is a serial driver on the communicator of 'space_disc', i.e. of its mesh. 
+#Monte Carlo samples are parallelised by building the mesh on COMM_SELF and distributing the samples among the ranks of COMM_WORLD.
 pStokesAlgorithm: TypeAlias = Callable[
     [SpaceDiscretisation, list[float], list[float], Function, Function, Optional[float], Optional[float], Optional[dict[float,Function]], Optional[float]],
     tuple[dict[float,Function],dict[float,Function]]
@@ -42,102 +47,262 @@ def get_algorithm_by_name(algorithm_name: str) -> pStokesAlgorithm:
             print(f"The algorithm '{algorithm_name}' is not avaiable.")
             raise NotImplementedError
 
-### implementations of abstract structure
-def implicitEuler_mixedFEM(space_disc: SpaceDiscretisation,
-                           time_grid: list[float],
-                           noise_steps: list[float], 
-                           noise_coefficient: Function,
-                           initial_condition: Function,
-                           p_value: float = 2.0,
-                           kappa_value: float = 0.1,
-                           time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
-    """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
+### time-stepping data that is shared by all calls with the same discretisation and parameters
+class _TimeSteppingSetup:
+    """Constants, functions, variational form and nonlinear solver of a mixed FEM time-stepping scheme. 
     
-    Return 'time -> velocity' and 'time -> pressure' dictionaries. """
-    # initialise constants in variational form
-    Re = Constant(Reynolds_number)
-    tau = Constant(1.0)
-    dW = Constant(1.0)
-
-    # initialise function objects
-    v, q = TestFunctions(space_disc.mixed_space)
-
-    up = Function(space_disc.mixed_space)
-    u, p = split(up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
-    velocity, pressure = up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
-
-    upold = Function(space_disc.mixed_space)
-    uold, pold = upold.subfunctions
-
-    # initialise deterministic forcing by zero as default 
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
-
-    # set initial condition to uold
-    uold.assign(initial_condition)
-
-    # build variational form
-    VariationalForm = ( 
-        inner(u - uold,v) 
-        + tau*( 1.0/Re*inner( S_tensor(grad(u),p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
-        - tau*inner(det_forcing,v)
-        - dW*inner(noise_coefficient, v)
-        )*dx
-
-    # setup initial time and time increments
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
-    time = initial_time
+    The variational form is built once by 'build_form' and its solver is reused by all time steps and Monte Carlo samples."""
+    def __init__(self, space_disc: SpaceDiscretisation, Reynolds_number: float, build_form: Callable[..., Form], solver_parameters: dict | None = None, form_compiler_parameters: dict = spectral_form_compiler) -> None:
+        self.space_disc = space_disc
+
+        # initialise constants in variational form
+        self.Re = Constant(Reynolds_number)
+        # deterministic and random time step share one constant, hence both are updated by a single write per step
+        self.step = Constant((1.0, 1.0))
+        self.tau = self.step[0]
+        self.dW = self.step[1]
+
+        # initialise function objects
+        self.v, self.q = TestFunctions(space_disc.mixed_space)
+
+        self.up = Function(space_disc.mixed_space)
+        self.u, self.p = split(self.up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
+        self.velocity, self.pressure = self.up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
+
+        # old solution; only the velocity enters the form, the pressure is zero and only stored as initial pressure
+        self.uold = Function(space_disc.velocity_space)
+        self.pold = Function(space_disc.pressure_space)
+
+        # intermediate solution, only used by multi-step schemes
+        self.uint = Function(space_disc.velocity_space)
+
+        # initialise deterministic forcing by zero as default 
+        self.det_forcing = Function(space_disc.velocity_space)
+
+        # integral of the pressure, built once for the mean-value correction of all time steps
+        self.pressure_integral = inner(self.pressure,1)*dx
+
+        # build variational form and solver
+        self.VariationalForm = build_form(self.u, self.p, self.v, self.q, self.uold, self.uint, self.tau, self.dW, self.Re, self.det_forcing)
+        self.problem = NonlinearVariationalProblem(self.VariationalForm, self.up, bcs=space_disc.bcs_mixed, form_compiler_parameters=form_compiler_parameters)
+        # the constant pressure mode is also removed from the residual, which keeps the singular linearised systems consistent
+        self.solver = NonlinearVariationalSolver(self.problem, nullspace=space_disc.null, transpose_nullspace=space_disc.null, solver_parameters=solver_parameters)
+
+        # projected divergences in the form; each reset checks them against in-place changes of the noise coefficient
+        self.divergence_projections = [coefficient.projection for coefficient in self.VariationalForm.coefficients() if isinstance(getattr(coefficient, "projection", None), _ProjectedDivergence)]
+
+        # solvers with other parameters, e.g. to monitor failed solves; built on first request
+        self._parameters_to_debug_solver = dict()
+
+    def debug_solver(self, solver_parameters: dict) -> NonlinearVariationalSolver:
+        """Return solver of the variational form with 'solver_parameters'. It is built once and reused by later requests."""
+        key = tuple(sorted(solver_parameters.items()))
+        if key not in self._parameters_to_debug_solver:
+            self._parameters_to_debug_solver[key] = NonlinearVariationalSolver(self.problem, nullspace=self.space_disc.null, transpose_nullspace=self.space_disc.null, solver_parameters=solver_parameters)
+        return self._parameters_to_debug_solver[key]
+
+    def reset(self, initial_condition: Function) -> None:
+        """Remove the state of previous calls and set the initial condition."""
+        self.up.assign(0)
+        self.det_forcing.assign(0)
+        for projection in self.divergence_projections:
+            projection.update()
+        self.uold.assign(initial_condition)
+        copy(self.uint,self.uold)
+        #the nonlinear solver starts from the current content of 'up'; hence, each step is warm started by the previous solution and the first by the initial condition
+        copy(self.velocity,self.uold)
+
+_key_to_setup: dict[tuple, _TimeSteppingSetup] = dict()
+
+def _get_setup(key: tuple, space_disc: SpaceDiscretisation, Reynolds_number: float, build_form: Callable[..., Form], solver_parameters: dict | None = None, form_compiler_parameters: dict = spectral_form_compiler) -> _TimeSteppingSetup:
+    """Return the time-stepping setup stored for 'key' and the solver parameters. If it is not available, build and store it."""
+    key = (*key, None if solver_parameters is None else tuple(sorted(solver_parameters.items())), tuple(sorted(form_compiler_parameters.items())))
+    if key not in _key_to_setup:
+        _key_to_setup[key] = _TimeSteppingSetup(space_disc,Reynolds_number,build_form,solver_parameters,form_compiler_parameters)
+    return _key_to_setup[key]
+
+class _ProjectedDivergence:
+    """Divergence of a vector field projected into discontinuous elements of one degree less. 
+    
+    For piecewise polynomial fields on affine meshes the projection is exact. It is only recomputed if the vector field changed since the last projection."""
+    def __init__(self, vector_field: Function) -> None:
+        degree = vector_field.ufl_element().degree()
+        #tensor product elements have a degree per factor
+        if isinstance(degree, tuple):
+            degree = max(degree)
+        self.vector_field = vector_field
+        self.divergence = Function(FunctionSpace(vector_field.function_space().mesh(), "DG", max(degree - 1, 0)))
+        self.projector = Projector(div(vector_field), self.divergence)
+        self.projected_dofs = None
+        self.update()
+
+    def update(self) -> None:
+        """Project the divergence if the degrees of freedom of the vector field changed."""
+        dofs = self.vector_field.dat.data_ro
+        if self.projected_dofs is None or not np.array_equal(self.projected_dofs, dofs):
+            self.projector.project()
+            self.projected_dofs = dofs.copy()
+
+def _projected_divergence(vector_field: Function) -> Function:
+    """Return the divergence of 'vector_field' in discontinuous elements of one degree less. 
+    
+    The projection is attached to the returned function; a setup whose form contains the function keeps it consistent with 'vector_field'."""
+    projection = _ProjectedDivergence(vector_field)
+    projection.divergence.projection = projection
+    return projection.divergence
+
+### shared time-stepping driver
+def _update_uold(index: int, setup: _TimeSteppingSetup) -> None:
+    """Update uold to proceed time-stepping."""
+    copy(setup.uold,setup.velocity)
+
+def _update_uold_and_uint(index: int, setup: _TimeSteppingSetup) -> None:
+    """Update old and intermediate solution to proceed time-stepping of a two-step scheme.
+    
+    Both functions are coefficients of the pre-built form. Hence, they are updated by copies instead of swapping them."""
+    if index >= 1:
+        copy(setup.uold,setup.uint)
+    copy(setup.uint,setup.velocity)
+
+def _run_mixed_stepper(setup: _TimeSteppingSetup,
+                       time_grid: list[float],
+                       noise_steps: list[float],
+                       initial_condition: Function,
+                       time_to_det_forcing: dict[float,Function] | None = None,
+                       post_step: Callable[[int,_TimeSteppingSetup],None] = _update_uold,
+                       debug_solver_parameters: dict = enable_monitoring,
+                       log_failures: bool = True,
+                       store_midpoints: bool = False,
+                       output_handler: OutputHandler | None = None,
+                       verbose: bool = True) -> tuple[dict[float,Function], ...]:
+    """Run the time-stepping of 'setup' and call 'post_step' after each step. The solutions are passed to 'output_handler', by default they are stored in memory.
+    
+    Return velocity and pressure in the format of 'output_handler', by default 'time -> velocity' and 'time -> pressure' dictionaries. 
+    If 'store_midpoints' is True, 'time -> velocity midpoint' is returned additionally."""
+    space_disc = setup.space_disc
+    step = setup.step
+    velocity, pressure = setup.velocity, setup.pressure
+    uold, pold, det_forcing = setup.uold, setup.pold, setup.det_forcing
 
-    # initialise storage for solution output
-    time_to_velocity = dict()
-    time_to_pressure = dict()
+    # set initial condition
+    setup.reset(initial_condition)
 
-    # store initialisation of time-stepping
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
+    # setup nodal times and increments; nodal times are taken from the grid instead of accumulating increments, which would drift in floating point
+    times = np.asarray(time_grid,dtype=np.float64)
+    nodal_times = times.tolist()
+    time_increments = np.diff(times).tolist()
+    noise_increments = np.asarray(noise_steps,dtype=np.float64).tolist()
 
     #check if deterministic and random increments are iterables of the same length
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
+    validate_increments(time_increments,noise_increments)
+
+    # if provided, collect the deterministic forcing of each step in advance
+    forcings = []
+    if time_to_det_forcing:
+        try:
+            forcings = [time_to_det_forcing[time] for time in nodal_times[1:]]
+        except KeyError as k:
+            print(f"Deterministic forcing couldn't be set.\nRequested time:\t {k}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
+            raise k
+
+    # initialise storage for solution output; midpoints are allocated at once and filled by vector operations
+    if output_handler is None:
+        output_handler = DictOutput()
+    output_handler.initialise(space_disc,nodal_times)
+    midpoint_storage = [Function(space_disc.velocity_space) for _ in nodal_times] if store_midpoints else []
+    time_to_velocity_midpoints = dict()
+
+    # store initialisation of time-stepping; the initial midpoint is zero
+    time = nodal_times[0]
+    output_handler.store(0,time,uold,pold)
+    if store_midpoints:
+        time_to_velocity_midpoints[time] = midpoint_storage[0]
 
-    for index in tqdm(range(len(time_increments))):
+    #the progress bar is refreshed at most every half second and at every percent of the steps, which keeps its overhead small for fast steps
+    for index in tqdm(range(len(time_increments)),mininterval=0.5,miniters=max(1,len(time_increments)//100),disable=not verbose):
         # update random and deterministc time step, and nodal time
-        dW.assign(noise_steps[index])
-        tau.assign(time_increments[index])
-        time += time_increments[index]
+        step.dat.data[:] = (time_increments[index], noise_increments[index])
+        time = nodal_times[index + 1]
         
         # if provided change deterministic forcing to provided one
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
+        if forcings:
+            det_forcing.assign(forcings[index])
         
         #try solve nonlinear problem by using firedrake blackbox. If default solve doesn't converge, restart solve with enbabled montoring to see why it fails. 
         try:   
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
+            setup.solver.solve()
         except ConvergenceError as e:
-            logging.exception(e)
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=enable_monitoring)
+            if log_failures:
+                logging.exception(e)
+            setup.debug_solver(debug_solver_parameters).solve()
 
-        #correct mean-value of pressure
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+        #correct mean-value of pressure; the nullspace only removes the mean of the dof vector, which is not the integral mean
+        remove_mean_value(pressure,space_disc,setup.pressure_integral)
 
         #store solution
-        time_to_velocity[time] = deepcopy(velocity)
-        time_to_pressure[time] = deepcopy(pressure)
+        output_handler.store(index + 1,time,velocity,pressure)
+        if store_midpoints:
+            average(midpoint_storage[index + 1],velocity,uold)
+            time_to_velocity_midpoints[time] = midpoint_storage[index + 1]
 
-        #update uold to proceed time-steppping
-        uold.assign(velocity)
+        #proceed time-stepping
+        post_step(index,setup)
 
+    time_to_velocity, time_to_pressure = output_handler.result()
+    if store_midpoints:
+        return time_to_velocity, time_to_pressure, time_to_velocity_midpoints
     return time_to_velocity, time_to_pressure
 
-def implicitEuler_mixedFEM_linearMulti(space_disc: SpaceDiscretisation,
+### implicit Euler schemes that only differ in the noise term
+def _noise_term(noise_scheme: str, u, uold, v, dW, noise_coefficient: Function):
+    """Return the integrand of the noise term of an implicit Euler step, which is subtracted in the variational form."""
+    match noise_scheme:
+        case "additive":
+            return dW*inner(noise_coefficient, v)
+        case "Ito transport":
+            return dW*inner(dot(grad(uold), noise_coefficient), v)
+        case "Stratonovich transport":
+            return dW/2.0*inner(dot(grad(u) + grad(uold), noise_coefficient), v)
+        case "Stratonovich transport with Temam symmetrisation":
+            # the divergence of the noise coefficient is projected once and only updated if the noise coefficient changes, instead of differentiating it in every assembly
+            return ( dW/2.0*inner(dot(grad(u) + grad(uold), noise_coefficient), v) 
+                    + dW/4.0*inner(_projected_divergence(noise_coefficient)*(u + uold), v) )
+        case other:
+            print(f"The noise scheme '{noise_scheme}' is not available.")
+            raise NotImplementedError
+
+def _implicitEuler_mixedFEM_with_noise(noise_scheme: str,
+                                       space_disc: SpaceDiscretisation,
+                                       time_grid: list[float],
+                                       noise_steps: list[float], 
+                                       noise_coefficient: Function,
+                                       initial_condition: Function,
+                                       p_value: float,
+                                       kappa_value: float,
+                                       time_to_det_forcing: dict[float,Function] | None, 
+                                       Reynolds_number: float,
+                                       solver_parameters: dict | None,
+                                       output_handler: OutputHandler | None,
+                                       verbose: bool) -> tuple[dict[float,Function], dict[float,Function]]:
+    """Solve p-Stokes system by the implicit Euler scheme with noise term specified by 'noise_scheme'.
+    
+    Return 'time -> velocity' and 'time -> pressure' dictionaries. """
+    # build variational form
+    def build_form(u, p, v, q, uold, uint, tau, dW, Re, det_forcing) -> Form:
+        return ( 
+            inner(u - uold,v) 
+            + tau*( 1.0/Re*inner( S_tensor(grad(u),p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
+            - tau*inner(det_forcing,v)
+            - _noise_term(noise_scheme,u,uold,v,dW,noise_coefficient)
+            )*dx
+
+    # get setup of time-stepping; forms and solver are reused by all calls with the same data
+    setup = _get_setup(("implicitEuler_mixedFEM", noise_scheme, id(space_disc), id(noise_coefficient), p_value, kappa_value, Reynolds_number),space_disc,Reynolds_number,build_form,solver_parameters)
+
+    return _run_mixed_stepper(setup,time_grid,noise_steps,initial_condition,time_to_det_forcing,output_handler=output_handler,verbose=verbose)
+
+### implementations of abstract structure
+def implicitEuler_mixedFEM(space_disc: SpaceDiscretisation,
                            time_grid: list[float],
                            noise_steps: list[float], 
                            noise_coefficient: Function,
@@ -146,91 +311,44 @@ def implicitEuler_mixedFEM_linearMulti(space_disc: SpaceDiscretisation,
                            kappa_value: float = 0.1,
                            time_to_det_forcing: dict[float,Function] | None = None, 
                            Reynolds_number: float = 1,
-                           noise_intensity: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           solver_parameters: dict | None = None,
+                           output_handler: OutputHandler | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
     
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
-    # initialise constants in variational form
-    Re = Constant(Reynolds_number)
-    tau = Constant(1.0)
-    dW = Constant(1.0)
-
-    # initialise function objects
-    v, q = TestFunctions(space_disc.mixed_space)
-
-    up = Function(space_disc.mixed_space)
-    u, p = split(up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
-    velocity, pressure = up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
-
-    upold = Function(space_disc.mixed_space)
-    uold, pold = upold.subfunctions
-
-    # initialise deterministic forcing by zero as default 
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
-
-    # set initial condition to uold
-    uold.assign(initial_condition)
+    return _implicitEuler_mixedFEM_with_noise("additive",space_disc,time_grid,noise_steps,noise_coefficient,initial_condition,p_value,kappa_value,
+                                              time_to_det_forcing,Reynolds_number,solver_parameters,output_handler,verbose)
 
+def implicitEuler_mixedFEM_linearMulti(space_disc: SpaceDiscretisation,
+                           time_grid: list[float],
+                           noise_steps: list[float], 
+                           noise_coefficient: Function,
+                           initial_condition: Function,
+                           p_value: float = 2.0,
+                           kappa_value: float = 0.1,
+                           time_to_det_forcing: dict[float,Function] | None = None, 
+                           Reynolds_number: float = 1,
+                           noise_intensity: float = 1,
+                           solver_parameters: dict | None = None,
+                           output_handler: OutputHandler | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
+    """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
+    
+    Return 'time -> velocity' and 'time -> pressure' dictionaries. """
     # build variational form
-    VariationalForm = ( 
-        inner(u - uold,v) 
-        + tau*( 1.0/Re*inner( S_tensor(grad(u),p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
-        - tau*inner(det_forcing,v)
-        - noise_intensity*dW*inner(uold, v)
-        )*dx
-
-    # setup initial time and time increments
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
-    time = initial_time
-
-    # initialise storage for solution output
-    time_to_velocity = dict()
-    time_to_pressure = dict()
-
-    # store initialisation of time-stepping
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
-
-    #check if deterministic and random increments are iterables of the same length
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
+    def build_form(u, p, v, q, uold, uint, tau, dW, Re, det_forcing) -> Form:
+        return ( 
+            inner(u - uold,v) 
+            + tau*( 1.0/Re*inner( S_tensor(grad(u),p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
+            - tau*inner(det_forcing,v)
+            - noise_intensity*dW*inner(uold, v)
+            )*dx
 
-    for index in tqdm(range(len(time_increments))):
-        # update random and deterministc time step, and nodal time
-        dW.assign(noise_steps[index])
-        tau.assign(time_increments[index])
-        time += time_increments[index]
-        
-        # if provided change deterministic forcing to provided one
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
-        
-        #try solve nonlinear problem by using firedrake blackbox. If default solve doesn't converge, restart solve with enbabled montoring to see why it fails. 
-        try:   
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
-        except ConvergenceError as e:
-            logging.exception(e)
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=enable_monitoring)
+    # get setup of time-stepping; forms and solver are reused by all calls with the same data
+    setup = _get_setup(("implicitEuler_mixedFEM_linearMulti", id(space_disc), id(noise_coefficient), p_value, kappa_value, Reynolds_number, noise_intensity),space_disc,Reynolds_number,build_form,solver_parameters)
 
-        #correct mean-value of pressure
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
-
-        #store solution
-        time_to_velocity[time] = deepcopy(velocity)
-        time_to_pressure[time] = deepcopy(pressure)
-
-        #update uold to proceed time-steppping
-        uold.assign(velocity)
-
-    return time_to_velocity, time_to_pressure
+    return _run_mixed_stepper(setup,time_grid,noise_steps,initial_condition,time_to_det_forcing,output_handler=output_handler,verbose=verbose)
 
 def implicitEuler_mixedFEM_linearMulti_withSymGrad(space_disc: SpaceDiscretisation,
                            time_grid: list[float],
@@ -241,91 +359,26 @@ def implicitEuler_mixedFEM_linearMulti_withSymGrad(space_disc: SpaceDiscretisati
                            kappa_value: float = 0.1,
                            time_to_det_forcing: dict[float,Function] | None = None, 
                            Reynolds_number: float = 1,
-                           noise_intensity: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           noise_intensity: float = 1,
+                           solver_parameters: dict | None = None,
+                           output_handler: OutputHandler | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
     
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
-    # initialise constants in variational form
-    Re = Constant(Reynolds_number)
-    tau = Constant(1.0)
-    dW = Constant(1.0)
-
-    # initialise function objects
-    v, q = TestFunctions(space_disc.mixed_space)
-
-    up = Function(space_disc.mixed_space)
-    u, p = split(up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
-    velocity, pressure = up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
-
-    upold = Function(space_disc.mixed_space)
-    uold, pold = upold.subfunctions
-
-    # initialise deterministic forcing by zero as default 
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
-
-    # set initial condition to uold
-    uold.assign(initial_condition)
-
     # build variational form
-    VariationalForm = ( 
-        inner(u - uold,v) 
-        + tau*( 1.0/Re*inner( S_tensor_sym(grad(u),p_value,kappa_value), epsilon(grad(v))) - inner(p, div(v)) + inner(div(u), q) )
-        - tau*inner(det_forcing,v)
-        - noise_intensity*dW*inner(uold, v)
-        )*dx
-
-    # setup initial time and time increments
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
-    time = initial_time
-
-    # initialise storage for solution output
-    time_to_velocity = dict()
-    time_to_pressure = dict()
+    def build_form(u, p, v, q, uold, uint, tau, dW, Re, det_forcing) -> Form:
+        return ( 
+            inner(u - uold,v) 
+            + tau*( 1.0/Re*inner( S_tensor_sym(grad(u),p_value,kappa_value), epsilon(grad(v))) - inner(p, div(v)) + inner(div(u), q) )
+            - tau*inner(det_forcing,v)
+            - noise_intensity*dW*inner(uold, v)
+            )*dx
 
-    # store initialisation of time-stepping
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
+    # get setup of time-stepping; forms and solver are reused by all calls with the same data
+    setup = _get_setup(("implicitEuler_mixedFEM_linearMulti_withSymGrad", id(space_disc), id(noise_coefficient), p_value, kappa_value, Reynolds_number, noise_intensity),space_disc,Reynolds_number,build_form,solver_parameters)
 
-    #check if deterministic and random increments are iterables of the same length
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
-
-    for index in tqdm(range(len(time_increments))):
-        # update random and deterministc time step, and nodal time
-        dW.assign(noise_steps[index])
-        tau.assign(time_increments[index])
-        time += time_increments[index]
-        
-        # if provided change deterministic forcing to provided one
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
-        
-        #try solve nonlinear problem by using firedrake blackbox. If default solve doesn't converge, restart solve with enbabled montoring to see why it fails. 
-        try:   
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
-        except ConvergenceError as e:
-            logging.exception(e)
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=enable_monitoring)
-
-        #correct mean-value of pressure
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
-
-        #store solution
-        time_to_velocity[time] = deepcopy(velocity)
-        time_to_pressure[time] = deepcopy(pressure)
-
-        #update uold to proceed time-steppping
-        uold.assign(velocity)
-
-    return time_to_velocity, time_to_pressure
+    return _run_mixed_stepper(setup,time_grid,noise_steps,initial_condition,time_to_det_forcing,output_handler=output_handler,verbose=verbose)
 
 def implicitEuler_mixedFEM_linearMulti_withSymGrad_approxOfAverages(space_disc: SpaceDiscretisation,
                            time_grid: list[float],
@@ -336,103 +389,29 @@ def implicitEuler_mixedFEM_linearMulti_withSymGrad_approxOfAverages(space_disc:
                            kappa_value: float = 0.1,
                            time_to_det_forcing: dict[float,Function] | None = None, 
                            Reynolds_number: float = 1,
-                           noise_intensity: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           noise_intensity: float = 1,
+                           solver_parameters: dict | None = None,
+                           output_handler: OutputHandler | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
     
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
-    # initialise constants in variational form
-    Re = Constant(Reynolds_number)
-    tau = Constant(1.0)
-    dW = Constant(1.0)
-
-    # initialise function objects
-    v, q = TestFunctions(space_disc.mixed_space)
-
-    up = Function(space_disc.mixed_space)
-    u, p = split(up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
-    velocity, pressure = up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
-
-    upold = Function(space_disc.mixed_space)
-    uold, pold = upold.subfunctions
-
-    ###intermediate solution
-    upint = Function(space_disc.mixed_space)
-    uint, pint = upint.subfunctions
-
-    # initialise deterministic forcing by zero as default 
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
-
-    # set initial condition
-    uold.assign(initial_condition)
-    uint.assign(initial_condition)
-
-    #meshpara
-    xcoord, ycoord = SpatialCoordinate(space_disc.mesh)
-
     # build variational form
-    VariationalForm = ( 
-        inner(u - uint,v) 
-        + tau*1.0/Re*inner( S_tensor_sym(grad(u),p_value,kappa_value), epsilon(grad(v)))
-        + tau*(- inner(p, div(v)) + inner(div(u), q) )
-        - tau*inner(det_forcing,v)
-        - noise_intensity*dW*inner(uold, v)
-        - dW*inner(noise_coefficient, v)
-        )*dx
-
-    # setup initial time and time increments
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
-    time = initial_time
-
-    # initialise storage for solution output
-    time_to_velocity = dict()
-    time_to_pressure = dict()
-
-    # store initialisation of time-stepping
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
-
-    #check if deterministic and random increments are iterables of the same length
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
-
-    for index in tqdm(range(len(time_increments))):
-        # update random and deterministc time step, and nodal time
-        dW.assign(noise_steps[index])
-        tau.assign(time_increments[index])
-        time += time_increments[index]
-        
-        # if provided change deterministic forcing to provided one
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
-        
-        #try solve nonlinear problem by using firedrake blackbox. If default solve doesn't converge, restart solve with enbabled montoring to see why it fails. 
-        try:   
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
-        except ConvergenceError as e:
-            #logging.exception(e)
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=direct_solve_details)
-
-        #correct mean-value of pressure
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
-
-        #store solution
-        time_to_velocity[time] = deepcopy(velocity)
-        time_to_pressure[time] = deepcopy(pressure)
-
-        #update old and intermediate solution to proceed time-steppping
-        if index >= 1:
-            uold.assign(uint)
-        uint.assign(velocity)
-
-    return time_to_velocity, time_to_pressure
+    def build_form(u, p, v, q, uold, uint, tau, dW, Re, det_forcing) -> Form:
+        return ( 
+            inner(u - uint,v) 
+            + tau*1.0/Re*inner( S_tensor_sym(grad(u),p_value,kappa_value), epsilon(grad(v)))
+            + tau*(- inner(p, div(v)) + inner(div(u), q) )
+            - tau*inner(det_forcing,v)
+            - noise_intensity*dW*inner(uold, v)
+            - dW*inner(noise_coefficient, v)
+            )*dx
+
+    # get setup of time-stepping; forms and solver are reused by all calls with the same data
+    setup = _get_setup(("implicitEuler_mixedFEM_linearMulti_withSymGrad_approxOfAverages", id(space_disc), id(noise_coefficient), p_value, kappa_value, Reynolds_number, noise_intensity),space_disc,Reynolds_number,build_form,solver_parameters)
+
+    return _run_mixed_stepper(setup,time_grid,noise_steps,initial_condition,time_to_det_forcing,
+                              post_step=_update_uold_and_uint,debug_solver_parameters=direct_solve_details,log_failures=False,output_handler=output_handler,verbose=verbose)
 
 def CrankNicolson_mixedFEM_strato_transportNoise(space_disc: SpaceDiscretisation,
                            time_grid: list[float],
@@ -442,91 +421,26 @@ def CrankNicolson_mixedFEM_strato_transportNoise(space_disc: SpaceDiscretisation
                            p_value: float = 2.0,
                            kappa_value: float = 0.1,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = None,
+                           output_handler: OutputHandler | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
     
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
-    # initialise constants in variational form
-    Re = Constant(Reynolds_number)
-    tau = Constant(1.0)
-    dW = Constant(1.0)
-
-    # initialise function objects
-    v, q = TestFunctions(space_disc.mixed_space)
-
-    up = Function(space_disc.mixed_space)
-    u, p = split(up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
-    velocity, pressure = up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
-
-    upold = Function(space_disc.mixed_space)
-    uold, pold = upold.subfunctions
-
-    # initialise deterministic forcing by zero as default 
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
-
-    # set initial condition to uold
-    uold.assign(initial_condition)
-
     # build variational form
-    VariationalForm = ( 
-        inner(u - uold,v) 
-        + tau*( 1.0/Re*inner( S_tensor((grad(u) + grad(uold))/2.0,p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
-        - tau*inner(det_forcing,v)
-        - dW/2.0*inner(dot(grad(u) + grad(uold), noise_coefficient), v)
-        )*dx
-
-    # setup initial time and time increments
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
-    time = initial_time
-
-    # initialise storage for solution output
-    time_to_velocity = dict()
-    time_to_pressure = dict()
+    def build_form(u, p, v, q, uold, uint, tau, dW, Re, det_forcing) -> Form:
+        return ( 
+            inner(u - uold,v) 
+            + tau*( 1.0/Re*inner( S_tensor((grad(u) + grad(uold))/2.0,p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
+            - tau*inner(det_forcing,v)
+            - dW/2.0*inner(dot(grad(u) + grad(uold), noise_coefficient), v)
+            )*dx
 
-    # store initialisation of time-stepping
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
+    # get setup of time-stepping; forms and solver are reused by all calls with the same data
+    setup = _get_setup(("CrankNicolson_mixedFEM_strato_transportNoise", id(space_disc), id(noise_coefficient), p_value, kappa_value, Reynolds_number),space_disc,Reynolds_number,build_form,solver_parameters)
 
-    #check if deterministic and random increments are iterables of the same length
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
-
-    for index in tqdm(range(len(time_increments))):
-        # update random and deterministc time step, and nodal time
-        dW.assign(noise_steps[index])
-        tau.assign(time_increments[index])
-        time += time_increments[index]
-        
-        # if provided change deterministic forcing to provided one
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
-        
-        #try solve nonlinear problem by using firedrake blackbox. If default solve doesn't converge, restart solve with enbabled montoring to see why it fails. 
-        try:   
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
-        except ConvergenceError as e:
-            logging.exception(e)
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=enable_monitoring)
-
-        #correct mean-value of pressure
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
-
-        #store solution
-        time_to_velocity[time] = deepcopy(velocity)
-        time_to_pressure[time] = deepcopy(pressure)
-
-        #update uold to proceed time-steppping
-        uold.assign(velocity)
-
-    return time_to_velocity, time_to_pressure
+    return _run_mixed_stepper(setup,time_grid,noise_steps,initial_condition,time_to_det_forcing,output_handler=output_handler,verbose=verbose)
 
 def CrankNicolson_mixedFEM_strato_transportNoise_withTemamsym(space_disc: SpaceDiscretisation,
                            time_grid: list[float],
@@ -536,92 +450,28 @@ def CrankNicolson_mixedFEM_strato_transportNoise_withTemamsym(space_disc: SpaceD
                            p_value: float = 2.0,
                            kappa_value: float = 0.1,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = None,
+                           output_handler: OutputHandler | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
     
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
-    # initialise constants in variational form
-    Re = Constant(Reynolds_number)
-    tau = Constant(1.0)
-    dW = Constant(1.0)
-
-    # initialise function objects
-    v, q = TestFunctions(space_disc.mixed_space)
+    # build variational form; the divergence of the noise coefficient is projected once and only updated if the noise coefficient changes, instead of differentiating it in every assembly
+    def build_form(u, p, v, q, uold, uint, tau, dW, Re, det_forcing) -> Form:
+        div_noise_coefficient = _projected_divergence(noise_coefficient)
+        return ( 
+            inner(u - uold,v) 
+            + tau*( 1.0/Re*inner( S_tensor((grad(u) + grad(uold))/2.0,p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
+            - tau*inner(det_forcing,v)
+            - dW/2.0*inner(dot(grad(u) + grad(uold), noise_coefficient), v)
+            - dW/4.0*inner(div_noise_coefficient*(u + uold), v)
+            )*dx
 
-    up = Function(space_disc.mixed_space)
-    u, p = split(up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
-    velocity, pressure = up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
+    # get setup of time-stepping; forms and solver are reused by all calls with the same data
+    setup = _get_setup(("CrankNicolson_mixedFEM_strato_transportNoise_withTemamsym", id(space_disc), id(noise_coefficient), p_value, kappa_value, Reynolds_number),space_disc,Reynolds_number,build_form,solver_parameters)
 
-    upold = Function(space_disc.mixed_space)
-    uold, pold = upold.subfunctions
-
-    # initialise deterministic forcing by zero as default 
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
-
-    # set initial condition to uold
-    uold.assign(initial_condition)
-
-    # build variational form
-    VariationalForm = ( 
-        inner(u - uold,v) 
-        + tau*( 1.0/Re*inner( S_tensor((grad(u) + grad(uold))/2.0,p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
-        - tau*inner(det_forcing,v)
-        - dW/2.0*inner(dot(grad(u) + grad(uold), noise_coefficient), v)
-        - dW/4.0*inner(div(noise_coefficient)* (u + uold), v)
-        )*dx
-
-    # setup initial time and time increments
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
-    time = initial_time
-
-    # initialise storage for solution output
-    time_to_velocity = dict()
-    time_to_pressure = dict()
-
-    # store initialisation of time-stepping
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
-
-    #check if deterministic and random increments are iterables of the same length
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
-
-    for index in tqdm(range(len(time_increments))):
-        # update random and deterministc time step, and nodal time
-        dW.assign(noise_steps[index])
-        tau.assign(time_increments[index])
-        time += time_increments[index]
-        
-        # if provided change deterministic forcing to provided one
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
-        
-        #try solve nonlinear problem by using firedrake blackbox. If default solve doesn't converge, restart solve with enbabled montoring to see why it fails. 
-        try:   
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
-        except ConvergenceError as e:
-            logging.exception(e)
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=enable_monitoring)
-
-        #correct mean-value of pressure
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
-
-        #store solution
-        time_to_velocity[time] = deepcopy(velocity)
-        time_to_pressure[time] = deepcopy(pressure)
-
-        #update uold to proceed time-steppping
-        uold.assign(velocity)
-
-    return time_to_velocity, time_to_pressure
+    return _run_mixed_stepper(setup,time_grid,noise_steps,initial_condition,time_to_det_forcing,output_handler=output_handler,verbose=verbose)
 
 
 def CrankNicolson_mixedFEM_strato_transportNoise_withAntisym(space_disc: SpaceDiscretisation,
@@ -632,97 +482,27 @@ def CrankNicolson_mixedFEM_strato_transportNoise_withAntisym(space_disc: SpaceDi
                            p_value: float = 2.0,
                            kappa_value: float = 0.1,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = None,
+                           output_handler: OutputHandler | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
     
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
-    # initialise constants in variational form
-    Re = Constant(Reynolds_number)
-    tau = Constant(1.0)
-    dW = Constant(1.0)
-
-    # initialise function objects
-    v, q = TestFunctions(space_disc.mixed_space)
-
-    up = Function(space_disc.mixed_space)
-    u, p = split(up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
-    velocity, pressure = up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
-
-    upold = Function(space_disc.mixed_space)
-    uold, pold = upold.subfunctions
-
-    # initialise deterministic forcing by zero as default 
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
-
-    # set initial condition to uold
-    uold.assign(initial_condition)
-
     # build variational form
-    VariationalForm = ( 
-        inner(u - uold,v) 
-        + tau*( 1.0/Re*inner( S_tensor((grad(u) + grad(uold))/2.0,p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
-        - tau*inner(det_forcing,v)
-        - dW/4.0*inner(dot(grad(u) + grad(uold), noise_coefficient), v)
-        + dW/4.0*inner(dot(grad(v), noise_coefficient), u + uold)
-        )*dx
-
-    # setup initial time and time increments
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
-    time = initial_time
-
-    # initialise storage for solution output
-    time_to_velocity = dict()
-    time_to_pressure = dict()
-    time_to_velocity_midpoints = dict()
+    def build_form(u, p, v, q, uold, uint, tau, dW, Re, det_forcing) -> Form:
+        return ( 
+            inner(u - uold,v) 
+            + tau*( 1.0/Re*inner( S_tensor((grad(u) + grad(uold))/2.0,p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
+            - tau*inner(det_forcing,v)
+            - dW/4.0*inner(dot(grad(u) + grad(uold), noise_coefficient), v)
+            + dW/4.0*inner(dot(grad(v), noise_coefficient), u + uold)
+            )*dx
 
-    # store initialisation of time-stepping
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_velocity_midpoints[time] = deepcopy(det_forcing)
-    time_to_pressure[time] = deepcopy(pold)
+    # get setup of time-stepping; forms and solver are reused by all calls with the same data
+    setup = _get_setup(("CrankNicolson_mixedFEM_strato_transportNoise_withAntisym", id(space_disc), id(noise_coefficient), p_value, kappa_value, Reynolds_number),space_disc,Reynolds_number,build_form,solver_parameters)
 
-    #check if deterministic and random increments are iterables of the same length
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
-
-    for index in tqdm(range(len(time_increments))):
-        # update random and deterministc time step, and nodal time
-        dW.assign(noise_steps[index])
-        tau.assign(time_increments[index])
-        time += time_increments[index]
-        
-        # if provided change deterministic forcing to provided one
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
-        
-        #try solve nonlinear problem by using firedrake blackbox. If default solve doesn't converge, restart solve with enbabled montoring to see why it fails. 
-        try:   
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
-        except ConvergenceError as e:
-            logging.exception(e)
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=enable_monitoring)
-
-        #correct mean-value of pressure
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
-
-        #store solution
-        time_to_velocity[time] = deepcopy(velocity)
-        velocity_mid = Function(space_disc.velocity_space)
-        velocity_mid.dat.data[:] = (velocity.dat.data + uold.dat.data)/2.0
-        time_to_velocity_midpoints[time] = deepcopy(velocity_mid)
-        time_to_pressure[time] = deepcopy(pressure)
-
-        #update uold to proceed time-steppping
-        uold.assign(velocity)
-
-    return time_to_velocity, time_to_pressure, time_to_velocity_midpoints
+    return _run_mixed_stepper(setup,time_grid,noise_steps,initial_condition,time_to_det_forcing,store_midpoints=True,output_handler=output_handler,verbose=verbose)
 
 
 def impliciteEuler_mixedFEM_ito_transportNoise(space_disc: SpaceDiscretisation,
@@ -733,91 +513,15 @@ def impliciteEuler_mixedFEM_ito_transportNoise(space_disc: SpaceDiscretisation,
                            p_value: float = 2.0,
                            kappa_value: float = 0.1,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = None,
+                           output_handler: OutputHandler | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
     
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
-    # initialise constants in variational form
-    Re = Constant(Reynolds_number)
-    tau = Constant(1.0)
-    dW = Constant(1.0)
-
-    # initialise function objects
-    v, q = TestFunctions(space_disc.mixed_space)
-
-    up = Function(space_disc.mixed_space)
-    u, p = split(up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
-    velocity, pressure = up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
-
-    upold = Function(space_disc.mixed_space)
-    uold, pold = upold.subfunctions
-
-    # initialise deterministic forcing by zero as default 
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
-
-    # set initial condition to uold
-    uold.assign(initial_condition)
-
-    # build variational form
-    VariationalForm = ( 
-        inner(u - uold,v) 
-        + tau*( 1.0/Re*inner( S_tensor(grad(u),p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
-        - tau*inner(det_forcing,v)
-        - dW*inner(dot(grad(uold), noise_coefficient), v)
-        )*dx
-
-    # setup initial time and time increments
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
-    time = initial_time
-
-    # initialise storage for solution output
-    time_to_velocity = dict()
-    time_to_pressure = dict()
-
-    # store initialisation of time-stepping
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
-
-    #check if deterministic and random increments are iterables of the same length
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
-
-    for index in tqdm(range(len(time_increments))):
-        # update random and deterministc time step, and nodal time
-        dW.assign(noise_steps[index])
-        tau.assign(time_increments[index])
-        time += time_increments[index]
-        
-        # if provided change deterministic forcing to provided one
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
-        
-        #try solve nonlinear problem by using firedrake blackbox. If default solve doesn't converge, restart solve with enbabled montoring to see why it fails. 
-        try:   
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
-        except ConvergenceError as e:
-            logging.exception(e)
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=enable_monitoring)
-
-        #correct mean-value of pressure
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
-
-        #store solution
-        time_to_velocity[time] = deepcopy(velocity)
-        time_to_pressure[time] = deepcopy(pressure)
-
-        #update uold to proceed time-steppping
-        uold.assign(velocity)
-
-    return time_to_velocity, time_to_pressure
+    return _implicitEuler_mixedFEM_with_noise("Ito transport",space_disc,time_grid,noise_steps,noise_coefficient,initial_condition,p_value,kappa_value,
+                                              time_to_det_forcing,Reynolds_number,solver_parameters,output_handler,verbose)
 
 
 def impliciteEuler_mixedFEM_strato_transportNoise(space_disc: SpaceDiscretisation,
@@ -828,91 +532,15 @@ def impliciteEuler_mixedFEM_strato_transportNoise(space_disc: SpaceDiscretisatio
                            p_value: float = 2.0,
                            kappa_value: float = 0.1,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = None,
+                           output_handler: OutputHandler | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
     
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
-    # initialise constants in variational form
-    Re = Constant(Reynolds_number)
-    tau = Constant(1.0)
-    dW = Constant(1.0)
-
-    # initialise function objects
-    v, q = TestFunctions(space_disc.mixed_space)
-
-    up = Function(space_disc.mixed_space)
-    u, p = split(up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
-    velocity, pressure = up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
-
-    upold = Function(space_disc.mixed_space)
-    uold, pold = upold.subfunctions
-
-    # initialise deterministic forcing by zero as default 
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
-
-    # set initial condition to uold
-    uold.assign(initial_condition)
-
-    # build variational form
-    VariationalForm = ( 
-        inner(u - uold,v) 
-        + tau*( 1.0/Re*inner( S_tensor(grad(u),p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
-        - tau*inner(det_forcing,v)
-        - dW/2.0*inner(dot(grad(u) + grad(uold), noise_coefficient), v)
-        )*dx
-
-    # setup initial time and time increments
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
-    time = initial_time
-
-    # initialise storage for solution output
-    time_to_velocity = dict()
-    time_to_pressure = dict()
-
-    # store initialisation of time-stepping
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
-
-    #check if deterministic and random increments are iterables of the same length
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
-
-    for index in tqdm(range(len(time_increments))):
-        # update random and deterministc time step, and nodal time
-        dW.assign(noise_steps[index])
-        tau.assign(time_increments[index])
-        time += time_increments[index]
-        
-        # if provided change deterministic forcing to provided one
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
-        
-        #try solve nonlinear problem by using firedrake blackbox. If default solve doesn't converge, restart solve with enbabled montoring to see why it fails. 
-        try:   
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
-        except ConvergenceError as e:
-            logging.exception(e)
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=enable_monitoring)
-
-        #correct mean-value of pressure
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
-
-        #store solution
-        time_to_velocity[time] = deepcopy(velocity)
-        time_to_pressure[time] = deepcopy(pressure)
-
-        #update uold to proceed time-steppping
-        uold.assign(velocity)
-
-    return time_to_velocity, time_to_pressure
+    return _implicitEuler_mixedFEM_with_noise("Stratonovich transport",space_disc,time_grid,noise_steps,noise_coefficient,initial_condition,p_value,kappa_value,
+                                              time_to_det_forcing,Reynolds_number,solver_parameters,output_handler,verbose)
 
 def impliciteEuler_mixedFEM_strato_transportNoise_withTemamsym(space_disc: SpaceDiscretisation,
                            time_grid: list[float],
@@ -922,89 +550,12 @@ def impliciteEuler_mixedFEM_strato_transportNoise_withTemamsym(space_disc: Space
                            p_value: float = 2.0,
                            kappa_value: float = 0.1,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = None,
+                           output_handler: OutputHandler | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve p-Stokes system with kappa regularisation and mixed finite elements. The viscous stress is given by S(A) = (kappa + |A|^2)^((p-2)/2)A.
     
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
-    # initialise constants in variational form
-    Re = Constant(Reynolds_number)
-    tau = Constant(1.0)
-    dW = Constant(1.0)
-
-    # initialise function objects
-    v, q = TestFunctions(space_disc.mixed_space)
-
-    up = Function(space_disc.mixed_space)
-    u, p = split(up)    # split types: <class 'ufl.tensors.ListTensor'> and <class 'ufl.indexed.Indexed'> needed for nonlinear solver
-    velocity, pressure = up.subfunctions    #subfunction types: <class 'firedrake.function.Function'> and <class 'firedrake.function.Function'>
-
-    upold = Function(space_disc.mixed_space)
-    uold, pold = upold.subfunctions
-
-    # initialise deterministic forcing by zero as default 
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
-
-    # set initial condition to uold
-    uold.assign(initial_condition)
-
-    # build variational form
-    VariationalForm = ( 
-        inner(u - uold,v) 
-        + tau*( 1.0/Re*inner( S_tensor(grad(u),p_value,kappa_value), grad(v)) - inner(p, div(v)) + inner(div(u), q) )
-        - tau*inner(det_forcing,v)
-        - dW/2.0*inner(dot(grad(u) + grad(uold), noise_coefficient), v)
-        - dW/4.0*inner(div(noise_coefficient)* (u + uold), v)
-        )*dx
-
-    # setup initial time and time increments
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
-    time = initial_time
-
-    # initialise storage for solution output
-    time_to_velocity = dict()
-    time_to_pressure = dict()
-
-    # store initialisation of time-stepping
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
-
-    #check if deterministic and random increments are iterables of the same length
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
-
-    for index in tqdm(range(len(time_increments))):
-        # update random and deterministc time step, and nodal time
-        dW.assign(noise_steps[index])
-        tau.assign(time_increments[index])
-        time += time_increments[index]
-        
-        # if provided change deterministic forcing to provided one
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
-        
-        #try solve nonlinear problem by using firedrake blackbox. If default solve doesn't converge, restart solve with enbabled montoring to see why it fails. 
-        try:   
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
-        except ConvergenceError as e:
-            logging.exception(e)
-            solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=enable_monitoring)
-
-        #correct mean-value of pressure
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
-
-        #store solution
-        time_to_velocity[time] = deepcopy(velocity)
-        time_to_pressure[time] = deepcopy(pressure)
-
-        #update uold to proceed time-steppping
-        uold.assign(velocity)
-
-    return time_to_velocity, time_to_pressure
\ No newline at end of file
+    return _implicitEuler_mixedFEM_with_noise("Stratonovich transport with Temam symmetrisation",space_disc,time_grid,noise_steps,noise_coefficient,initial_condition,p_value,kappa_value,
+                                              time_to_det_forcing,Reynolds_number,solver_parameters,output_handler,verbose)
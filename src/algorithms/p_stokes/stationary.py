@@ -3,6 +3,7 @@ import logging
 from typing import TypeAlias, Callable, Optional
 
 from src.discretisation.space import SpaceDiscretisation
+from src.discretisation.projections import remove_mean_value
 from src.algorithms.nonlinearities import S_tensor
 from src.algorithms.solver_configs import enable_monitoring
 
@@ -37,8 +38,6 @@ def mixedFEM(space_disc: SpaceDiscretisation,
         solve(VariationalForm == 0, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null, solver_parameters=enable_monitoring)
 
     #correct pressure mean
-    mean_p = Constant(assemble( inner(p,1)*dx ))
-
-    pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+    remove_mean_value(pressure,space_disc)
     
     return velocity, pressure
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""Contains the parareal iteration, which parallelises the time-stepping of a single trajectory."""
+import numpy as np
+from firedrake import Function, FunctionSpace, COMM_SELF
+
+from src.algorithms.select import Algorithm
+from src.algorithms.p_stokes.parabolic import implicitEuler_mixedFEM_linearMulti_withSymGrad_approxOfAverages
+from src.discretisation.space import SpaceDiscretisation
+from src.math.distances.space import l2_distance
+
+#schemes that carry a history of previous steps; each propagation restarts from a velocity only, hence the history would be reset at every chunk boundary
+_MULTI_STEP_ALGORITHMS = (implicitEuler_mixedFEM_linearMulti_withSymGrad_approxOfAverages,)
+
+def _array_to_function(array: np.ndarray, function_space: FunctionSpace) -> Function:
+    """Return function in 'function_space' whose degrees of freedom are given by 'array'."""
+    function = Function(function_space)
+    function.dat.data[:] = array
+    return function
+
+def parareal(algorithm: Algorithm,
+             space_disc: SpaceDiscretisation,
+             time_grid: list[float],
+             noise_steps: list[float],
+             noise_coefficient: Function,
+             initial_condition: Function,
+             number_of_chunks: int,
+             iterations: int,
+             comm = COMM_SELF,
+             **kwargs) -> tuple[dict[float,Function],dict[float,Function]]:
+    """Solve with 'algorithm' by the parareal iteration. The keyword arguments are passed to 'algorithm'.
+
+    The time grid is split into chunks with the same number of steps. The coarse propagator performs a single step per chunk with the summed noise increments,
+    the fine propagator steps through the grid of the chunk with the original noise increments.
+    The fine solves of an iteration are independent and distributed among the ranks of 'comm'. In this case, each rank needs its own copy of the mesh, i.e. a mesh on COMM_SELF.
+    Only one-step schemes are supported, since a propagation is started from the velocity alone. Progress bars of the propagations are disabled unless 'verbose' is passed.
+
+    Return 'time -> velocity' and 'time -> pressure' dictionaries of the fine solution started at the final parareal iterates."""
+    if algorithm in _MULTI_STEP_ALGORITHMS:
+        msg = "Parareal requires a one-step scheme, but the algorithm carries a history of previous steps."
+        msg += f"\nAlgorithm:\t {algorithm.__name__}"
+        raise ValueError(msg)
+    if not initial_condition.function_space() == space_disc.velocity_space:
+        msg = "Parareal requires an initial condition in the velocity space of the space discretisation."
+        msg += f"\nSpace of initial condition:\t {initial_condition.function_space()}"
+        msg += f"\nVelocity space:\t {space_disc.velocity_space}"
+        raise ValueError(msg)
+    kwargs.setdefault("verbose",False)
+    time_grid = np.asarray(time_grid,dtype=np.float64)
+    noise_steps = np.asarray(noise_steps,dtype=np.float64)
+    steps = len(time_grid) - 1
+    if not steps % number_of_chunks == 0:
+        msg = "Number of time steps is not divisible by the number of chunks."
+        msg += f"\nNumber of time steps:\t {steps}"
+        msg += f"\nNumber of chunks:\t {number_of_chunks}"
+        raise ValueError(msg)
+    chunk_steps = steps//number_of_chunks
+    chunk_to_fine_grid = [time_grid[n*chunk_steps:(n + 1)*chunk_steps + 1] for n in range(number_of_chunks)]
+    chunk_to_fine_noise = [noise_steps[n*chunk_steps:(n + 1)*chunk_steps] for n in range(number_of_chunks)]
+    chunk_to_coarse_grid = [fine_grid[[0,-1]] for fine_grid in chunk_to_fine_grid]
+    chunk_to_coarse_noise = [np.array([fine_noise.sum()]) for fine_noise in chunk_to_fine_noise]
+    local_chunks = range(comm.rank,number_of_chunks,comm.size)
+
+    def propagate(chunk: int, velocity: np.ndarray, coarse: bool) -> tuple[dict[float,Function],dict[float,Function]]:
+        """Return the solution on 'chunk' that is started at 'velocity'."""
+        time_to_velocity, time_to_pressure, *_ = algorithm(space_disc=space_disc,
+                                                           time_grid=chunk_to_coarse_grid[chunk] if coarse else chunk_to_fine_grid[chunk],
+                                                           noise_steps=chunk_to_coarse_noise[chunk] if coarse else chunk_to_fine_noise[chunk],
+                                                           noise_coefficient=noise_coefficient,
+                                                           initial_condition=_array_to_function(velocity,space_disc.velocity_space),
+                                                           **kwargs)
+        return time_to_velocity, time_to_pressure
+
+    def end_velocity(chunk: int, velocity: np.ndarray, coarse: bool) -> np.ndarray:
+        """Return the velocity at the end of 'chunk' that is started at 'velocity'."""
+        time_to_velocity, _ = propagate(chunk,velocity,coarse)
+        return time_to_velocity[chunk_to_fine_grid[chunk][-1]].dat.data_ro.copy()
+
+    ### initial coarse sweep
+    chunk_to_start = [initial_condition.dat.data_ro.copy()]
+    chunk_to_coarse_end = []
+    for chunk in range(number_of_chunks):
+        chunk_to_coarse_end.append(end_velocity(chunk,chunk_to_start[chunk],coarse=True))
+        chunk_to_start.append(chunk_to_coarse_end[chunk].copy())
+
+    ### parareal iteration: U(n+1) = G(U_new(n)) + F(U_old(n)) - G(U_old(n))
+    for _ in range(iterations):
+        local_chunk_to_fine_end = {chunk: end_velocity(chunk,chunk_to_start[chunk],coarse=False) for chunk in local_chunks}
+        chunk_to_fine_end = dict()
+        for rank_chunk_to_fine_end in comm.allgather(local_chunk_to_fine_end):
+            chunk_to_fine_end.update(rank_chunk_to_fine_end)
+        for chunk in range(number_of_chunks):
+            coarse_end = end_velocity(chunk,chunk_to_start[chunk],coarse=True)
+            chunk_to_start[chunk + 1] = coarse_end + chunk_to_fine_end[chunk] - chunk_to_coarse_end[chunk]
+            chunk_to_coarse_end[chunk] = coarse_end
+
+    ### fine solution of all chunks; the initial time of a chunk is the end time of the previous one and only stored once
+    local_chunk_to_solution = dict()
+    for chunk in local_chunks:
+        time_to_velocity, time_to_pressure = propagate(chunk,chunk_to_start[chunk],coarse=False)
+        times = list(time_to_velocity.keys())[(0 if chunk == 0 else 1):]
+        local_chunk_to_solution[chunk] = [(time, time_to_velocity[time].dat.data_ro.copy(), time_to_pressure[time].dat.data_ro.copy()) for time in times]
+    chunk_to_solution = dict()
+    for rank_chunk_to_solution in comm.allgather(local_chunk_to_solution):
+        chunk_to_solution.update(rank_chunk_to_solution)
+
+    time_to_velocity = dict()
+    time_to_pressure = dict()
+    for chunk in range(number_of_chunks):
+        for time, velocity, pressure in chunk_to_solution[chunk]:
+            time_to_velocity[time] = _array_to_function(velocity,space_disc.velocity_space)
+            time_to_pressure[time] = _array_to_function(pressure,space_disc.pressure_space)
+    return time_to_velocity, time_to_pressure
+
+### consistency check of the coarse/fine correction
+def serial_deviation(algorithm: Algorithm,
+                     space_disc: SpaceDiscretisation,
+                     time_grid: list[float],
+                     noise_steps: list[float],
+                     noise_coefficient: Function,
+                     initial_condition: Function,
+                     number_of_chunks: int = 1,
+                     comm = COMM_SELF,
+                     **kwargs) -> float:
+    """Return the maximal L2 distance of the velocities of parareal and the serial fine solution over all nodal times. The keyword arguments are passed to 'algorithm'.
+
+    Parareal is run with as many iterations as chunks, after which it reproduces the serial solution up to solver tolerances. 
+    With a single chunk, the propagation of the fine solution is checked; with several chunks, also the coarse/fine correction."""
+    kwargs.setdefault("verbose",False)
+    parareal_velocity, _ = parareal(algorithm,space_disc,time_grid,noise_steps,noise_coefficient,initial_condition,
+                                    number_of_chunks,number_of_chunks,comm,**kwargs)
+    serial_velocity, _, *_ = algorithm(space_disc=space_disc,time_grid=time_grid,noise_steps=noise_steps,
+                                       noise_coefficient=noise_coefficient,initial_condition=initial_condition,**kwargs)
+    return max(l2_distance(parareal_velocity[time],serial_velocity[time]) for time in serial_velocity.keys())
@@ -1,5 +1,7 @@
 import logging
+import numpy as np
 from typing import TypeAlias
+from functools import lru_cache
 
 from src.algorithms.stokes.parabolic import get_algorithm_by_name as get_Stokes_algorithm
 from src.algorithms.stokes.parabolic import StokesAlgorithm
@@ -11,6 +13,7 @@ from src.string_formatting import format_header
 Algorithm: TypeAlias = StokesAlgorithm | pStokesAlgorithm
 
 ### converter that maps model and algorithm names to its implementation
+@lru_cache(maxsize=None)
 def select_algorithm(model_name: str, algorithm_name: str) -> Algorithm:
     """Return requested algorithm for specified model."""
     msg = format_header("MODEL and ALGORITHM")
@@ -24,7 +27,11 @@ def select_algorithm(model_name: str, algorithm_name: str) -> Algorithm:
         case other:
             print(f"The model '{model_name}' is not available.")
             raise NotImplementedError
-            
-                
 
- 
\ No newline at end of file
+### ahead-of-time compilation
+def warmup_algorithm(algorithm: Algorithm, **kwargs) -> None:
+    """Run 'algorithm' for a single time step without noise. The keyword arguments are passed to 'algorithm'.
+    
+    This generates and compiles the kernels of its forms, which are stored in the disk caches of firedrake and reused by later runs. 
+    The cache locations are set by the environment variables PYOP2_CACHE_DIR and FIREDRAKE_TSFC_KERNEL_CACHE_DIR."""
+    algorithm(time_grid=np.array([0.0,1.0]),noise_steps=[0.0],**kwargs)
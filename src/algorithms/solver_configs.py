@@ -27,4 +27,120 @@ direct_solve_details = {'snes_monitor': None,
            'pc_factor_mat_solver_type': 'mumps',
            "mat_mumps_icntl_14": 5000,
            "mat_mumps_icntl_24": 1,
-           }
\ No newline at end of file
+           }
+
+#nested block matrix with full Schur complement factorisation: algebraic multigrid for the velocity block and LU for the 'selfp' approximation of the Schur complement
+#the Schur complement inherits the constant pressure kernel, hence MUMPS is asked to detect null pivots
+fieldsplit_schur = {"mat_type": "nest",
+                    "ksp_type": "fgmres",
+                    "pc_type": "fieldsplit",
+                    "pc_fieldsplit_type": "schur",
+                    "pc_fieldsplit_schur_fact_type": "full",
+                    "pc_fieldsplit_schur_precondition": "selfp",
+                    "fieldsplit_0_ksp_type": "preonly",
+                    "fieldsplit_0_pc_type": "hypre",
+                    "fieldsplit_1_ksp_type": "preonly",
+                    "fieldsplit_1_pc_type": "lu",
+                    "fieldsplit_1_pc_factor_mat_solver_type": "mumps",
+                    "fieldsplit_1_mat_mumps_icntl_24": 1,
+                    }
+
+#Newton iteration with Schur complement preconditioned GMRES; cheaper per step than 'fieldsplit schur' since the 'selfp' approximation of the Schur complement is only Jacobi preconditioned
+#the pressure block of the mixed system vanishes, hence the default 'a11' preconditioner of the Schur complement would be zero
+#it relies on a good initial iterate, which is the solution of the previous time step
+newton_fieldsplit_schur = {"snes_type": "newtonls",
+                           "snes_rtol": 1e-8,
+                           "snes_linesearch_type": "basic",
+                           "mat_type": "nest",
+                           "ksp_type": "fgmres",
+                           "pc_type": "fieldsplit",
+                           "pc_fieldsplit_type": "schur",
+                           "pc_fieldsplit_schur_fact_type": "full",
+                           "pc_fieldsplit_schur_precondition": "selfp",
+                           "fieldsplit_0_ksp_type": "preonly",
+                           "fieldsplit_0_pc_type": "hypre",
+                           "fieldsplit_1_ksp_type": "preonly",
+                           "fieldsplit_1_pc_type": "jacobi",
+                           }
+
+#inexact Newton iteration: the linear systems are solved to a loose relative tolerance and the Newton tolerance is tied to the time discretisation error
+#the relative Newton tolerance is 'C*time_stepsize**2', which is below the error of the time discretisation of order at most one, but never tighter than the 1e-8 of 'newton fieldsplit schur'
+#hence, the Newton iteration is relaxed for coarse time steps instead of over-solving the nonlinear systems
+#each solve starts at the solution of the previous time step, which is close to the new one for small time steps; hence, few Newton steps are needed
+def inexact_newton_fieldsplit_schur(time_stepsize: float, C: float = 1.0) -> dict:
+    """Return parameters of 'newton fieldsplit schur' with tolerances adapted to 'time_stepsize'."""
+    return newton_fieldsplit_schur | {"snes_rtol": max(1e-8, C*time_stepsize**2),
+                                      "snes_atol": 1e-10,
+                                      "ksp_rtol": 1e-4,
+                                      "ksp_atol": 1e-10,
+                                      }
+
+#Jacobian-free Newton-Krylov: the Jacobian is only applied by finite differences of the residual and the assembled Jacobian is merely used to build the preconditioner
+#the preconditioner is rebuilt every second Newton step and persists over time steps, hence the nonlinear Jacobian is assembled far less often than by 'newton fieldsplit schur'
+#for small problems, where assembly is cheap, the materialised Jacobian of the other configurations is usually faster
+jacobian_free_newton = {"snes_type": "newtonls",
+                        "snes_rtol": 1e-8,
+                        "snes_mf_operator": None,
+                        "snes_lag_jacobian": 2,
+                        "snes_lag_jacobian_persists": True,
+                        "mat_type": "aij",
+                        "ksp_type": "gmres",
+                        "pc_type": "fieldsplit",
+                        "pc_fieldsplit_type": "schur",
+                        "pc_fieldsplit_schur_fact_type": "full",
+                        "pc_fieldsplit_schur_precondition": "selfp",
+                        "fieldsplit_0_ksp_type": "preonly",
+                        "fieldsplit_0_pc_type": "hypre",
+                        "fieldsplit_1_ksp_type": "preonly",
+                        "fieldsplit_1_pc_type": "jacobi",
+                        }
+
+#Schur complement preconditioned FGMRES for the linear Stokes systems; algebraic multigrid for the velocity block and Jacobi for the 'selfp' approximation of the Schur complement
+#the monolithic matrix is kept, since the system is only assembled once per time step
+stokes_fieldsplit_schur = {"mat_type": "aij",
+                           "ksp_type": "fgmres",
+                           "pc_type": "fieldsplit",
+                           "pc_fieldsplit_type": "schur",
+                           "pc_fieldsplit_schur_fact_type": "full",
+                           "pc_fieldsplit_schur_precondition": "selfp",
+                           "fieldsplit_0_ksp_type": "preonly",
+                           "fieldsplit_0_pc_type": "hypre",
+                           "fieldsplit_1_ksp_type": "preonly",
+                           "fieldsplit_1_pc_type": "jacobi",
+                           }
+
+#the mass matrix is symmetric positive definite, hence it is factorised once by Cholesky and reused by all projections
+mass_cholesky = {"ksp_type": "preonly",
+                 "pc_type": "cholesky",
+                 "pc_factor_mat_solver_type": "mumps"}
+
+#form compiler parameters of the p-Stokes forms; the spectral mode factorises the quadrature loops of the nonlinear stress
+#the exponent of the stress is passed as python float and hence compiled as literal into the kernel
+spectral_form_compiler = {"mode": "spectral"}
+
+### converter that maps a string representation of the solver configuration to its parameters
+def get_solver_parameters(solver_name: str, time_stepsize: float | None = None) -> dict | None:
+    """Return requested solver parameters. The default 'None' uses the firedrake defaults. 
+    
+    Configurations with tolerances that depend on the time step require 'time_stepsize'."""
+    match solver_name:
+        case "default":
+            return None
+        case "direct":
+            return direct_solve
+        case "fieldsplit schur":
+            return fieldsplit_schur
+        case "newton fieldsplit schur":
+            return newton_fieldsplit_schur
+        case "inexact newton fieldsplit schur":
+            if time_stepsize is None:
+                msg = f"The solver configuration '{solver_name}' requires a time step size."
+                raise ValueError(msg)
+            return inexact_newton_fieldsplit_schur(time_stepsize)
+        case "jacobian free newton":
+            return jacobian_free_newton
+        case "stokes fieldsplit schur":
+            return stokes_fieldsplit_schur
+        case other:
+            print(f"The solver configuration '{solver_name}' is not available.")
+            raise NotImplementedError
@@ -1,11 +1,13 @@
 from firedrake import *
-from copy import deepcopy
+import numpy as np
 from tqdm import tqdm
 from typing import TypeAlias, Callable, Optional
 
-from src.discretisation.time import trajectory_to_incremets
+from src.discretisation.time import trajectory_to_incremets, validate_increments
 from src.discretisation.space import SpaceDiscretisation
+from src.discretisation.projections import remove_mean_value
 from src.algorithms.solver_configs import enable_light_monitoring, direct_solve
+from src.math.vector_operations import axpby, copy
 
 ### abstract structure of a Stokes algorithm
 StokesAlgorithm: TypeAlias = Callable[
@@ -34,6 +36,32 @@ def get_algorithm_by_name(algorithm_name: str) -> StokesAlgorithm:
             print(f"The algorithm '{algorithm_name}' is not avaiable.")
             raise NotImplementedError
 
+### utilities of the time-stepping
+def _forcings_at_nodal_times(time_grid: list[float], time_to_det_forcing: dict[float,Function] | None) -> list[Function]:
+    """Return the deterministic forcing of each time step, i.e. at all nodal times except the initial one. If no forcing is provided, return an empty list.
+    
+    The forcings are looked up once by the nodal times of the grid; hence, time-stepping can access them by the index of the step."""
+    if not time_to_det_forcing:
+        return []
+    try:
+        return [time_to_det_forcing[time] for time in time_grid[1:]]
+    except KeyError as k:
+        print(f"Deterministic forcing couldn't be set.\nRequested time:\t {k}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
+        raise k
+
+#zero forcings are stored by the id of their velocity space; the forcing keeps its space alive, hence the id cannot be reused by other spaces
+_space_to_zero_forcing: dict[int,Function] = dict()
+
+def _det_forcing(space_disc: SpaceDiscretisation, time_to_det_forcing: dict[float,Function] | None) -> Function:
+    """Return the velocity function that holds the deterministic forcing of a time step.
+    
+    If no forcing is provided, the shared zero forcing is returned. It is never assigned, since there are no forcings at nodal times in this case."""
+    if not time_to_det_forcing:
+        if id(space_disc.velocity_space) not in _space_to_zero_forcing:
+            _space_to_zero_forcing[id(space_disc.velocity_space)] = Function(space_disc.velocity_space)
+        return _space_to_zero_forcing[id(space_disc.velocity_space)]
+    return Function(space_disc.velocity_space)
+
 ### implementations of abstract structure
 def implicitEuler_mixedFEM(space_disc: SpaceDiscretisation,
                            time_grid: list[float],
@@ -41,9 +69,13 @@ def implicitEuler_mixedFEM(space_disc: SpaceDiscretisation,
                            noise_coefficient: Function,
                            initial_condition: Function,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve Stokes system with mixed finite elements. 
     
+    The linear systems are solved with 'solver_parameters', see 'src.algorithms.solver_configs'.
+
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
 
     u, p = TrialFunctions(space_disc.mixed_space)
@@ -55,7 +87,7 @@ def implicitEuler_mixedFEM(space_disc: SpaceDiscretisation,
 
     upold = Function(space_disc.mixed_space)
     uold, pold = upold.subfunctions
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
+    det_forcing = _det_forcing(space_disc,time_to_det_forcing)
 
     uold.assign(initial_condition)
 
@@ -65,43 +97,44 @@ def implicitEuler_mixedFEM(space_disc: SpaceDiscretisation,
     up = Function(space_disc.mixed_space)
     u, p = up.subfunctions
 
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
+    #problem, solver and pressure integral are built once and reused by all time steps; the operator depends on the step sizes and is reassembled in every step
+    problem = LinearVariationalProblem(a, L, up, bcs=space_disc.bcs_mixed, constant_jacobian=False)
+    solver = LinearVariationalSolver(problem, nullspace=space_disc.null, solver_parameters=solver_parameters)
+    pressure_integral = inner(p,1)*dx
+
+    #nodal times and increments are converted to float lists once; nodal times are taken from the grid
+    nodal_times = np.asarray(time_grid,dtype=np.float64).tolist()
+    initial_time, time_increments = trajectory_to_incremets(nodal_times)
+    noise_increments = np.asarray(noise_steps,dtype=np.float64).tolist()
     time = initial_time
+    forcings = _forcings_at_nodal_times(time_grid,time_to_det_forcing)
 
  
     time_to_velocity = dict()
     time_to_pressure = dict()
 
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
+    time_to_velocity[time] = uold.copy(deepcopy=True)
+    time_to_pressure[time] = pold.copy(deepcopy=True)
 
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
+    validate_increments(time_increments,noise_increments)
 
-    for index in tqdm(range(len(time_increments))):
-        dW.assign(noise_steps[index])
+    for index in tqdm(range(len(time_increments)),disable=not verbose):
+        dW.assign(noise_increments[index])
         tau.assign(time_increments[index])
-        time += time_increments[index]
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
+        time = nodal_times[index + 1]
+        if forcings:
+            det_forcing.assign(forcings[index])
             
-        solve(a == L, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
+        solver.solve()
 
         #Mean correction
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        p.dat.data[:] = p.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+        remove_mean_value(p,space_disc,pressure_integral)
 
-        time_to_velocity[time] = deepcopy(u)
-        time_to_pressure[time] = deepcopy(p)
+        time_to_velocity[time] = u.copy(deepcopy=True)
+        time_to_pressure[time] = p.copy(deepcopy=True)
 
-        upold.assign(up)
+        #only the velocity enters the forms as old solution
+        copy(uold,u)
 
     return time_to_velocity, time_to_pressure
 
@@ -111,7 +144,8 @@ def Chorin_splitting(space_disc: SpaceDiscretisation,
                      noise_coefficient: Function,
                      initial_condition: Function,
                      time_to_det_forcing: dict[float,Function] | None = None,
-                     Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                     Reynolds_number: float = 1,
+                     verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve Stokes system with Chorin splitting. 
     
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
@@ -119,7 +153,7 @@ def Chorin_splitting(space_disc: SpaceDiscretisation,
     Re = Constant(Reynolds_number)
     tau = Constant(1.0)
     dW = Constant(1.0)
-    det_forcing = Function(space_disc.velocity_space)
+    det_forcing = _det_forcing(space_disc,time_to_det_forcing)
 
     u = TrialFunction(space_disc.velocity_space)
     v = TestFunction(space_disc.velocity_space)
@@ -142,45 +176,47 @@ def Chorin_splitting(space_disc: SpaceDiscretisation,
 
     V_basis = VectorSpaceBasis(constant=True)
 
+    #problems and solvers of the three substeps and the pressure integral are built once and reused by all time steps
+    #only the operator of the tentative velocity depends on the step size; the operators of the pressure and velocity update are assembled once
+    solver_tentative_velocity = LinearVariationalSolver(LinearVariationalProblem(a1, L1, utilde, bcs=space_disc.bcs_vel, constant_jacobian=False))
+    solver_pressure = LinearVariationalSolver(LinearVariationalProblem(a2, L2, pnew, constant_jacobian=True), nullspace=V_basis)
+    solver_velocity = LinearVariationalSolver(LinearVariationalProblem(a3, L3, unew, constant_jacobian=True))
+    pressure_integral = inner(pnew,1)*dx
+
     uold.assign(initial_condition)
 
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
+    #nodal times and increments are converted to float lists once; nodal times are taken from the grid
+    nodal_times = np.asarray(time_grid,dtype=np.float64).tolist()
+    initial_time, time_increments = trajectory_to_incremets(nodal_times)
+    noise_increments = np.asarray(noise_steps,dtype=np.float64).tolist()
     time = initial_time
+    forcings = _forcings_at_nodal_times(time_grid,time_to_det_forcing)
 
  
     time_to_velocity = dict()
     time_to_pressure = dict()
 
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pnew)
+    time_to_velocity[time] = uold.copy(deepcopy=True)
+    time_to_pressure[time] = pnew.copy(deepcopy=True)
 
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
+    validate_increments(time_increments,noise_increments)
 
-    for index in tqdm(range(len(time_increments))):
-        dW.assign(noise_steps[index])
+    for index in tqdm(range(len(time_increments)),disable=not verbose):
+        dW.assign(noise_increments[index])
         tau.assign(time_increments[index])
-        time += time_increments[index]
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
+        time = nodal_times[index + 1]
+        if forcings:
+            det_forcing.assign(forcings[index])
         
-        solve(a1 == L1, utilde, bcs=space_disc.bcs_vel)
-        solve(a2 == L2, pnew, nullspace = V_basis)
-        solve(a3 == L3, unew)
+        solver_tentative_velocity.solve()
+        solver_pressure.solve()
+        solver_velocity.solve()
 
         #Mean correction
-        mean_p = Constant(assemble( inner(pnew,1)*dx ))
-        pnew.dat.data[:] = pnew.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+        remove_mean_value(pnew,space_disc,pressure_integral)
 
-        time_to_velocity[time] = deepcopy(unew)
-        time_to_pressure[time] = deepcopy(pnew)
+        time_to_velocity[time] = unew.copy(deepcopy=True)
+        time_to_pressure[time] = pnew.copy(deepcopy=True)
 
         uold.assign(unew)
 
@@ -193,9 +229,13 @@ def impliciteEuler_mixedFEM_ito_transportNoise(space_disc: SpaceDiscretisation,
                            noise_coefficient: Function,
                            initial_condition: Function,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve Stokes system with mixed finite elements. 
     
+    The linear systems are solved with 'solver_parameters', see 'src.algorithms.solver_configs'.
+
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
 
     u, p = TrialFunctions(space_disc.mixed_space)
@@ -207,7 +247,7 @@ def impliciteEuler_mixedFEM_ito_transportNoise(space_disc: SpaceDiscretisation,
 
     upold = Function(space_disc.mixed_space)
     uold, pold = upold.subfunctions
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
+    det_forcing = _det_forcing(space_disc,time_to_det_forcing)
 
     uold.assign(initial_condition)
 
@@ -217,43 +257,44 @@ def impliciteEuler_mixedFEM_ito_transportNoise(space_disc: SpaceDiscretisation,
     up = Function(space_disc.mixed_space)
     u, p = up.subfunctions
 
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
+    #problem, solver and pressure integral are built once and reused by all time steps; the operator depends on the step sizes and is reassembled in every step
+    problem = LinearVariationalProblem(a, L, up, bcs=space_disc.bcs_mixed, constant_jacobian=False)
+    solver = LinearVariationalSolver(problem, nullspace=space_disc.null, solver_parameters=solver_parameters)
+    pressure_integral = inner(p,1)*dx
+
+    #nodal times and increments are converted to float lists once; nodal times are taken from the grid
+    nodal_times = np.asarray(time_grid,dtype=np.float64).tolist()
+    initial_time, time_increments = trajectory_to_incremets(nodal_times)
+    noise_increments = np.asarray(noise_steps,dtype=np.float64).tolist()
     time = initial_time
+    forcings = _forcings_at_nodal_times(time_grid,time_to_det_forcing)
 
  
     time_to_velocity = dict()
     time_to_pressure = dict()
 
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
+    time_to_velocity[time] = uold.copy(deepcopy=True)
+    time_to_pressure[time] = pold.copy(deepcopy=True)
 
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
+    validate_increments(time_increments,noise_increments)
 
-    for index in tqdm(range(len(time_increments))):
-        dW.assign(noise_steps[index])
+    for index in tqdm(range(len(time_increments)),disable=not verbose):
+        dW.assign(noise_increments[index])
         tau.assign(time_increments[index])
-        time += time_increments[index]
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
+        time = nodal_times[index + 1]
+        if forcings:
+            det_forcing.assign(forcings[index])
             
-        solve(a == L, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
+        solver.solve()
 
         #Mean correction
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        p.dat.data[:] = p.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+        remove_mean_value(p,space_disc,pressure_integral)
 
-        time_to_velocity[time] = deepcopy(u)
-        time_to_pressure[time] = deepcopy(p)
+        time_to_velocity[time] = u.copy(deepcopy=True)
+        time_to_pressure[time] = p.copy(deepcopy=True)
 
-        upold.assign(up)
+        #only the velocity enters the forms as old solution
+        copy(uold,u)
 
     return time_to_velocity, time_to_pressure
 
@@ -263,9 +304,13 @@ def impliciteEuler_mixedFEM_strato_transportNoise_asym(space_disc: SpaceDiscreti
                            noise_coefficient: Function,
                            initial_condition: Function,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve Stokes system with mixed finite elements. 
     
+    The linear systems are solved with 'solver_parameters', see 'src.algorithms.solver_configs'.
+
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
 
     u, p = TrialFunctions(space_disc.mixed_space)
@@ -277,7 +322,7 @@ def impliciteEuler_mixedFEM_strato_transportNoise_asym(space_disc: SpaceDiscreti
 
     upold = Function(space_disc.mixed_space)
     uold, pold = upold.subfunctions
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
+    det_forcing = _det_forcing(space_disc,time_to_det_forcing)
 
     uold.assign(initial_condition)
 
@@ -287,50 +332,54 @@ def impliciteEuler_mixedFEM_strato_transportNoise_asym(space_disc: SpaceDiscreti
     up = Function(space_disc.mixed_space)
     u, p = up.subfunctions
 
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
+    #problem, solver and pressure integral are built once and reused by all time steps; the operator depends on the step sizes and is reassembled in every step
+    problem = LinearVariationalProblem(a, L, up, bcs=space_disc.bcs_mixed, constant_jacobian=False)
+    solver = LinearVariationalSolver(problem, nullspace=space_disc.null, solver_parameters=solver_parameters)
+    pressure_integral = inner(p,1)*dx
+    #forms of the diagnostic checks, they are assembled in every step
+    cancellation_form = dW/4.0*( inner(dot(grad(u),noise_coefficient), u) - inner(dot(grad(u),noise_coefficient), u) )*dx
+    divergence_form = inner(p, div(u))*dx
+
+    #nodal times and increments are converted to float lists once; nodal times are taken from the grid
+    nodal_times = np.asarray(time_grid,dtype=np.float64).tolist()
+    initial_time, time_increments = trajectory_to_incremets(nodal_times)
+    noise_increments = np.asarray(noise_steps,dtype=np.float64).tolist()
     time = initial_time
+    forcings = _forcings_at_nodal_times(time_grid,time_to_det_forcing)
 
  
     time_to_velocity = dict()
     time_to_pressure = dict()
 
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
+    time_to_velocity[time] = uold.copy(deepcopy=True)
+    time_to_pressure[time] = pold.copy(deepcopy=True)
 
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
+    validate_increments(time_increments,noise_increments)
 
-    for index in tqdm(range(len(time_increments))):
+    for index in tqdm(range(len(time_increments)),disable=not verbose):
 
-        dW.assign(noise_steps[index])
+        dW.assign(noise_increments[index])
         #dW.assign(np.sqrt(time_increments[index]))
         tau.assign(time_increments[index])
-        time += time_increments[index]
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
+        time = nodal_times[index + 1]
+        if forcings:
+            det_forcing.assign(forcings[index])
             
-        solve(a == L, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null) 
+        solver.solve()
 
         ###check various terms
-        check_cancel = assemble( dW/4.0*( inner(dot(grad(u),noise_coefficient), u) - inner(dot(grad(u),noise_coefficient), u) )*dx )
-        check_div = assemble( inner(p, div(u))*dx )
+        check_cancel = assemble(cancellation_form)
+        check_div = assemble(divergence_form)
         print(f"time = {time}\ncheck_cancel = {check_cancel:.2E}\ncheck_div = {check_div:.2E}")
 
         #Mean correction
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        p.dat.data[:] = p.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+        remove_mean_value(p,space_disc,pressure_integral)
 
-        time_to_velocity[time] = deepcopy(u)
-        time_to_pressure[time] = deepcopy(p)
+        time_to_velocity[time] = u.copy(deepcopy=True)
+        time_to_pressure[time] = p.copy(deepcopy=True)
 
-        upold.assign(up)
+        #only the velocity enters the forms as old solution
+        copy(uold,u)
 
     return time_to_velocity, time_to_pressure
 
@@ -340,9 +389,13 @@ def CrankNicolson_mixedFEM_strato_transportNoise(space_disc: SpaceDiscretisation
                            noise_coefficient: Function,
                            initial_condition: Function,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = None,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve Stokes system with mixed finite elements. 
     
+    The linear systems are solved with 'solver_parameters', see 'src.algorithms.solver_configs'.
+
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
 
     u, p = TrialFunctions(space_disc.mixed_space)
@@ -354,7 +407,7 @@ def CrankNicolson_mixedFEM_strato_transportNoise(space_disc: SpaceDiscretisation
 
     upold = Function(space_disc.mixed_space)
     uold, pold = upold.subfunctions
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
+    det_forcing = _det_forcing(space_disc,time_to_det_forcing)
 
     uold.assign(initial_condition)
 
@@ -365,44 +418,45 @@ def CrankNicolson_mixedFEM_strato_transportNoise(space_disc: SpaceDiscretisation
     up = Function(space_disc.mixed_space)
     u, p = up.subfunctions
 
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
+    #problem, solver and pressure integral are built once and reused by all time steps; the operator depends on the step sizes and is reassembled in every step
+    problem = LinearVariationalProblem(a, L, up, bcs=space_disc.bcs_mixed, constant_jacobian=False)
+    solver = LinearVariationalSolver(problem, nullspace=space_disc.null, solver_parameters=solver_parameters)
+    pressure_integral = inner(p,1)*dx
+
+    #nodal times and increments are converted to float lists once; nodal times are taken from the grid
+    nodal_times = np.asarray(time_grid,dtype=np.float64).tolist()
+    initial_time, time_increments = trajectory_to_incremets(nodal_times)
+    noise_increments = np.asarray(noise_steps,dtype=np.float64).tolist()
     time = initial_time
+    forcings = _forcings_at_nodal_times(time_grid,time_to_det_forcing)
 
  
     time_to_velocity = dict()
     time_to_pressure = dict()
 
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
+    time_to_velocity[time] = uold.copy(deepcopy=True)
+    time_to_pressure[time] = pold.copy(deepcopy=True)
 
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
+    validate_increments(time_increments,noise_increments)
 
-    for index in tqdm(range(len(time_increments))):
-        dW.assign(noise_steps[index])
+    for index in tqdm(range(len(time_increments)),disable=not verbose):
+        dW.assign(noise_increments[index])
         tau.assign(time_increments[index])
-        time += time_increments[index]
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
+        time = nodal_times[index + 1]
+        if forcings:
+            det_forcing.assign(forcings[index])
             
         #solve for u(n+1)
-        solve(a == L, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
+        solver.solve()
 
         #Mean correction
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        p.dat.data[:] = p.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+        remove_mean_value(p,space_disc,pressure_integral)
 
-        time_to_velocity[time] = deepcopy(u)
-        time_to_pressure[time] = deepcopy(p)
+        time_to_velocity[time] = u.copy(deepcopy=True)
+        time_to_pressure[time] = p.copy(deepcopy=True)
 
-        upold.assign(up)
+        #only the velocity enters the forms as old solution
+        copy(uold,u)
 
     return time_to_velocity, time_to_pressure
 
@@ -412,9 +466,13 @@ def CrankNicolson_mixedFEM_strato_transportNoise_asym(space_disc: SpaceDiscretis
                            noise_coefficient: Function,
                            initial_condition: Function,
                            time_to_det_forcing: dict[float,Function] | None = None, 
-                           Reynolds_number: float = 1) -> tuple[dict[float,Function], dict[float,Function]]:
+                           Reynolds_number: float = 1,
+                           solver_parameters: dict | None = enable_light_monitoring,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve Stokes system with mixed finite elements. 
     
+    The linear systems are solved with 'solver_parameters', see 'src.algorithms.solver_configs'.
+
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
 
     u, p = TrialFunctions(space_disc.mixed_space)
@@ -426,7 +484,7 @@ def CrankNicolson_mixedFEM_strato_transportNoise_asym(space_disc: SpaceDiscretis
 
     upold = Function(space_disc.mixed_space)
     uold, pold = upold.subfunctions
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
+    det_forcing = _det_forcing(space_disc,time_to_det_forcing)
 
     uold.assign(initial_condition)
 
@@ -436,60 +494,64 @@ def CrankNicolson_mixedFEM_strato_transportNoise_asym(space_disc: SpaceDiscretis
     up = Function(space_disc.mixed_space)
     u, p = up.subfunctions
 
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
+    #problem, solver and pressure integral are built once and reused by all time steps; the operator depends on the step sizes and is reassembled in every step
+    problem = LinearVariationalProblem(a, L, up, bcs=space_disc.bcs_mixed, constant_jacobian=False)
+    solver = LinearVariationalSolver(problem, nullspace=space_disc.null, solver_parameters=solver_parameters)
+    pressure_integral = inner(p,1)*dx
+    #forms of the diagnostic checks, they are assembled in every step
+    cancellation_form = dW/4.0*( inner(dot(grad(u),noise_coefficient), u) - inner(dot(grad(u),noise_coefficient), u) )*dx
+    divergence_form = inner(p, div(u))*dx
+
+    #nodal times and increments are converted to float lists once; nodal times are taken from the grid
+    nodal_times = np.asarray(time_grid,dtype=np.float64).tolist()
+    initial_time, time_increments = trajectory_to_incremets(nodal_times)
+    noise_increments = np.asarray(noise_steps,dtype=np.float64).tolist()
     time = initial_time
+    forcings = _forcings_at_nodal_times(time_grid,time_to_det_forcing)
 
  
     time_to_velocity = dict()
     time_to_pressure = dict()
 
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
+    time_to_velocity[time] = uold.copy(deepcopy=True)
+    time_to_pressure[time] = pold.copy(deepcopy=True)
 
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
+    validate_increments(time_increments,noise_increments)
 
-    for index in tqdm(range(len(time_increments))):
+    for index in tqdm(range(len(time_increments)),disable=not verbose):
         #set time step parameters
-        dW.assign(noise_steps[index])
+        dW.assign(noise_increments[index])
         #dW.assign(np.sqrt(time_increments[index]))
         tau.assign(time_increments[index])
-        time += time_increments[index]
+        time = nodal_times[index + 1]
 
         #load det forcing if needed
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
+        if forcings:
+            det_forcing.assign(forcings[index])
             
         #solve for u(n+1/2)    
-        solve(a == L, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null,solver_parameters=enable_light_monitoring)
+        solver.solve()
 
         #extrapolation to obtain u(n+1)
-        check_div_half = assemble( inner(p, div(u))*dx )
-        u.dat.data[:] = 2*u.dat.data - uold.dat.data
+        check_div_half = assemble(divergence_form)
+        axpby(u,-1.0,2.0,uold)
         #p.dat.data[:] = 2*p.dat.data - pold.dat.data
 
         ###check various terms
-        check_cancel = assemble( dW/4.0*( inner(dot(grad(u),noise_coefficient), u) - inner(dot(grad(u),noise_coefficient), u) )*dx )
-        check_div = assemble( inner(p, div(u))*dx )
+        check_cancel = assemble(cancellation_form)
+        check_div = assemble(divergence_form)
         print(f"time = {time}\ncheck_cancel = {check_cancel:.2E}\ncheck_div = {check_div:.2E}\ncheck_div_halftime = {check_div_half:.2E}")
 
 
         #Mean correction
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        p.dat.data[:] = p.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+        remove_mean_value(p,space_disc,pressure_integral)
 
 
-        time_to_velocity[time] = deepcopy(u)
-        time_to_pressure[time] = deepcopy(p)
+        time_to_velocity[time] = u.copy(deepcopy=True)
+        time_to_pressure[time] = p.copy(deepcopy=True)
 
-        upold.assign(up)
+        #only the velocity enters the forms as old solution
+        copy(uold,u)
 
     return time_to_velocity, time_to_pressure
 
@@ -501,9 +563,13 @@ def ThetaScheme_mixedFEM_strato_transportNoise_asym(space_disc: SpaceDiscretisat
                            initial_condition: Function,
                            time_to_det_forcing: dict[float,Function] | None = None, 
                            Reynolds_number: float = 1,
-                           theta: float = 4/8.0) -> tuple[dict[float,Function], dict[float,Function]]:
+                           theta: float = 4/8.0,
+                           solver_parameters: dict | None = enable_light_monitoring,
+                           verbose: bool = True) -> tuple[dict[float,Function], dict[float,Function]]:
     """Solve Stokes system with mixed finite elements. 
     
+    The linear systems are solved with 'solver_parameters', see 'src.algorithms.solver_configs'.
+
     Return 'time -> velocity' and 'time -> pressure' dictionaries. """
 
     u, p = TrialFunctions(space_disc.mixed_space)
@@ -516,7 +582,7 @@ def ThetaScheme_mixedFEM_strato_transportNoise_asym(space_disc: SpaceDiscretisat
 
     upold = Function(space_disc.mixed_space)
     uold, pold = upold.subfunctions
-    det_forcing, _ = Function(space_disc.mixed_space).subfunctions
+    det_forcing = _det_forcing(space_disc,time_to_det_forcing)
 
     uold.assign(initial_condition)
 
@@ -526,60 +592,64 @@ def ThetaScheme_mixedFEM_strato_transportNoise_asym(space_disc: SpaceDiscretisat
     up = Function(space_disc.mixed_space)
     u, p = up.subfunctions
 
-    initial_time, time_increments = trajectory_to_incremets(time_grid)
+    #problem, solver and pressure integral are built once and reused by all time steps; the operator depends on the step sizes and is reassembled in every step
+    problem = LinearVariationalProblem(a, L, up, bcs=space_disc.bcs_mixed, constant_jacobian=False)
+    solver = LinearVariationalSolver(problem, nullspace=space_disc.null, solver_parameters=solver_parameters)
+    pressure_integral = inner(p,1)*dx
+    #forms of the diagnostic checks, they are assembled in every step
+    cancellation_form = dW/4.0*( inner(dot(grad(u),noise_coefficient), u) - inner(dot(grad(u),noise_coefficient), u) )*dx
+    divergence_form = inner(p, div(u))*dx
+
+    #nodal times and increments are converted to float lists once; nodal times are taken from the grid
+    nodal_times = np.asarray(time_grid,dtype=np.float64).tolist()
+    initial_time, time_increments = trajectory_to_incremets(nodal_times)
+    noise_increments = np.asarray(noise_steps,dtype=np.float64).tolist()
     time = initial_time
+    forcings = _forcings_at_nodal_times(time_grid,time_to_det_forcing)
 
  
     time_to_velocity = dict()
     time_to_pressure = dict()
 
-    time_to_velocity[time] = deepcopy(uold)
-    time_to_pressure[time] = deepcopy(pold)
+    time_to_velocity[time] = uold.copy(deepcopy=True)
+    time_to_pressure[time] = pold.copy(deepcopy=True)
 
-    if not len(time_increments) == len(noise_steps):
-        msg_error = "Time grid and noise grid are not of the same length.\n"
-        msg_error += f"Time grid length: \t {len(time_increments)}\n"
-        msg_error += f"Noise grid length: \t {len(noise_steps)}"
-        raise ValueError(msg_error)
+    validate_increments(time_increments,noise_increments)
 
-    for index in tqdm(range(len(time_increments))):
+    for index in tqdm(range(len(time_increments)),disable=not verbose):
         #set time step parameters
-        dW.assign(noise_steps[index])
+        dW.assign(noise_increments[index])
         #dW.assign(np.sqrt(time_increments[index]))
         tau.assign(time_increments[index])
-        time += time_increments[index]
+        time = nodal_times[index + 1]
 
         #load det forcing if needed
-        if time_to_det_forcing:
-            try:
-                det_forcing.assign(time_to_det_forcing[time])
-            except KeyError as k:
-                print(f"Deterministic forcing couldn't be set.\nRequested time:\t {time}\nAvailable times:\t {list(time_to_det_forcing.keys())}")
-                raise k
+        if forcings:
+            det_forcing.assign(forcings[index])
             
         #solve for u(n+theta)    
-        solve(a == L, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null,solver_parameters=enable_light_monitoring)
+        solver.solve()
 
         #extrapolation to obtain u(n+1)
         print(f"theta = {theta}")
-        check_div_half = assemble( inner(p, div(u))*dx )
-        u.dat.data[:] = 1/theta*u.dat.data + (1 - 1/theta)*uold.dat.data
+        check_div_half = assemble(divergence_form)
+        axpby(u,1 - 1/theta,1/theta,uold)
 
         ###check various terms
-        check_cancel = assemble( dW/4.0*( inner(dot(grad(u),noise_coefficient), u) - inner(dot(grad(u),noise_coefficient), u) )*dx )
-        check_div = assemble( inner(p, div(u))*dx )
+        check_cancel = assemble(cancellation_form)
+        check_div = assemble(divergence_form)
         print(f"time = {time}\ncheck_cancel = {check_cancel:.2E}\ncheck_div = {check_div:.2E}\ncheck_div_{theta}-time = {check_div_half:.2E}")
 
 
         #Mean correction
-        mean_p = Constant(assemble( inner(p,1)*dx ))
-        p.dat.data[:] = p.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+        remove_mean_value(p,space_disc,pressure_integral)
 
 
-        time_to_velocity[time] = deepcopy(u)
-        time_to_pressure[time] = deepcopy(p)
+        time_to_velocity[time] = u.copy(deepcopy=True)
+        time_to_pressure[time] = p.copy(deepcopy=True)
 
-        upold.assign(up)
+        #only the velocity enters the forms as old solution
+        copy(uold,u)
 
     return time_to_velocity, time_to_pressure
 
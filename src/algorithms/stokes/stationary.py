@@ -2,6 +2,7 @@ from firedrake import *
 from typing import TypeAlias, Callable, Optional
 
 from src.discretisation.space import SpaceDiscretisation
+from src.discretisation.projections import remove_mean_value
 
 ### abstract stationary Stokes algorithms
 StationaryStokesAlgorithm: TypeAlias = Callable[[SpaceDiscretisation,Optional[Function]],tuple[Function,Function]]
@@ -29,8 +30,7 @@ def mixedFEM(space_disc: SpaceDiscretisation,
     solve(a == L, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
     
     #Mean correction
-    mean_pressure = Constant(assemble( inner(pressure,1)*dx ))
-    pressure.dat.data[:] = pressure.dat.data - Function(space_disc.pressure_space).assign(mean_pressure).dat.data
+    remove_mean_value(pressure,space_disc)
     
     return velocity, pressure
 
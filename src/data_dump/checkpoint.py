@@ -0,0 +1,25 @@
+import os
+import pickle
+import logging
+
+def save_checkpoint(name_file: str, checkpoint: dict) -> None:
+    """Save checkpoint into file.
+
+    The checkpoint is first written to a temporary file that replaces 'name_file' afterwards. Hence, an interrupted write never corrupts an older checkpoint."""
+    name_tmp_file = name_file + ".tmp"
+    with open(name_tmp_file,"wb") as file:
+        pickle.dump(checkpoint,file,protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(name_tmp_file,name_file)
+    logging.info(f"Checkpoint saved in:\t {name_file}")
+
+def load_checkpoint(name_file: str) -> dict | None:
+    """Return checkpoint stored in file. If the file does not exist, return None."""
+    if not os.path.isfile(name_file):
+        return None
+    with open(name_file,"rb") as file:
+        return pickle.load(file)
+
+def remove_checkpoint(name_file: str) -> None:
+    """Remove checkpoint file if it exists."""
+    if os.path.isfile(name_file):
+        os.remove(name_file)
@@ -1,6 +1,5 @@
 import sqlite3
 from firedrake import Function
-from copy import deepcopy
 from contextlib import contextmanager
 
 from src.discretisation.mesh import MeshObject
@@ -209,7 +208,7 @@ def get_time_to_velocity(name_database: str, seed_Id: int, refinement_level: int
             u.dat.data[id,0] = xvalue
             u.dat.data[id,1] = yvalue
             if id == space_disc.velocity_dofs-1:
-                time_to_velocity[time] = deepcopy(u)            
+                time_to_velocity[time] = u.copy(deepcopy=True)            
     return time_to_velocity
 
 def get_time_to_pressure(name_database: str, seed_Id: int, refinement_level: int, space_disc: SpaceDiscretisation) -> dict[float,Function]:
@@ -232,7 +231,7 @@ def get_time_to_pressure(name_database: str, seed_Id: int, refinement_level: int
         for time, id, value in cursor.fetchall():            
             p.dat.data[id] = value
             if id == space_disc.pressure_dofs-1:
-                time_to_pressure[time] = deepcopy(p)
+                time_to_pressure[time] = p.copy(deepcopy=True)
     return time_to_pressure
 
 def get_time_to_solution(name_database: str, seed_Id: int, refinement_level: int, 
@@ -37,8 +37,9 @@ def save_time_to_velocity(name_database: str, seed_Id: int, refinement_level: in
     """Save 'time -> velocity' dictionary to database."""
     data = []
     for time in time_to_velocity:
+        velocity_data = time_to_velocity[time].dat.data_ro
         for dof_Id in range(velocity_dofs):
-            data_tuple = seed_Id, refinement_level, time, dof_Id, time_to_velocity[time].dat.data[dof_Id,0], time_to_velocity[time].dat.data[dof_Id,1]
+            data_tuple = seed_Id, refinement_level, time, dof_Id, velocity_data[dof_Id,0], velocity_data[dof_Id,1]
             data.append(data_tuple)
     save_much_data_to_table(name_database,"velocity",data)
 
@@ -46,8 +47,9 @@ def save_time_to_pressure(name_database: str, seed_Id: int, refinement_level: in
     """Save 'time -> pressure' dictionary to databse."""
     data = []
     for time in time_to_pressure:
+        pressure_data = time_to_pressure[time].dat.data_ro
         for dof_Id in range(pressure_dofs):
-            data_tuple = seed_Id, refinement_level, time, dof_Id, time_to_pressure[time].dat.data[dof_Id]
+            data_tuple = seed_Id, refinement_level, time, dof_Id, pressure_data[dof_Id]
             data.append(data_tuple)
     save_much_data_to_table(name_database,"pressure",data)
 
@@ -1,28 +1,41 @@
 import netgen
+import os
+from functools import lru_cache
 from netgen.meshing import Mesh as ngMesh
 
 from firedrake import UnitSquareMesh, COMM_WORLD, Mesh
 
 from src.string_formatting import format_header
 
+#mesh files are located relative to this module, hence meshes can be loaded from any working directory
+MESH_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)),"mesh_files")
+
+@lru_cache(maxsize=None)
+def _load_netgen_mesh(name_file: str) -> ngMesh:
+    """Return netgen mesh stored in 'name_file' of the mesh directory. The file is only read and parsed on the first request."""
+    ngmesh = ngMesh()
+    ngmesh.Load(os.path.join(MESH_DIRECTORY,name_file))
+    return ngmesh
+
 ### converter that maps a mesh name and some resolution parameter to an implemenation
-def get_mesh(name_mesh: str, space_resolution: str, comm = COMM_WORLD):
-    """Return mesh based on name and resolution."""
+def get_mesh(name_mesh: str, space_resolution: str, comm = COMM_WORLD, reorder: bool = True):
+    """Return mesh based on name and resolution. 
+    
+    If 'reorder' is True, the mesh entities are renumbered (reverse Cuthill-McKee) to improve data locality in assembly."""
     match name_mesh:
         case "unit square":
-            return UnitSquareMesh(32,32,name = name_mesh,comm=comm)
+            return UnitSquareMesh(32,32,name = name_mesh,comm=comm,reorder=reorder)
         case "unit_square_non_singular":
-            ngmesh = ngMesh()
             match space_resolution:
                 case "low":
-                    ngmesh.Load("src/discretisation/mesh_files/unit_square_non_singular_0.vol")
+                    ngmesh = _load_netgen_mesh("unit_square_non_singular_0.vol")
                 case "intermediate":
-                    ngmesh.Load("src/discretisation/mesh_files/unit_square_non_singular_1.vol")
+                    ngmesh = _load_netgen_mesh("unit_square_non_singular_1.vol")
                 case "high":
-                    ngmesh.Load("src/discretisation/mesh_files/unit_square_non_singular_2.vol")
+                    ngmesh = _load_netgen_mesh("unit_square_non_singular_2.vol")
                 case other:
                     raise NotImplementedError
-            return Mesh(ngmesh, name = name_mesh, distribution_name = name_mesh, permutation_name= name_mesh, comm=comm)
+            return Mesh(ngmesh, name = name_mesh, distribution_name = name_mesh, permutation_name= name_mesh, comm=comm, reorder=reorder)
         case "unit L-shape":
             raise NotImplementedError
         case other:
@@ -30,13 +43,15 @@ def get_mesh(name_mesh: str, space_resolution: str, comm = COMM_WORLD):
 
 class MeshObject:
     """Store mesh parameter."""
-    def __init__(self, name_mesh: str, space_resolution: str, comm = COMM_WORLD):
+    def __init__(self, name_mesh: str, space_resolution: str, comm = COMM_WORLD, reorder: bool = True):
         self.name = name_mesh
         self.space_resolution = space_resolution
-        self.mesh = get_mesh(name_mesh, space_resolution, comm)
+        self.reorder = reorder
+        self.mesh = get_mesh(name_mesh, space_resolution, comm, reorder)
 
     def __str__(self):
         out = format_header("MESH")
         out += f"\nName: \t \t {self.name}"
         out += f"\nSpace resolution: \t {self.space_resolution}"
+        out += f"\nReordered: \t {self.reorder}"
         return out
@@ -1,6 +1,41 @@
 from firedrake import *
 
 from src.discretisation.space import SpaceDiscretisation
+from src.math.vector_operations import shift
+from src.algorithms.solver_configs import mass_cholesky
+
+def remove_mean_value(function: Function, space_disc: SpaceDiscretisation, integral_form: Form | None = None) -> None:
+    """Subtract the mean value from a scalar function in place. 
+    
+    The mean is subtracted from all dofs by a single vector shift without allocating a temporary function.
+    Repeated corrections of the same function can pass its pre-built 'integral_form' to reuse the cached assembly."""
+    if integral_form is None:
+        integral_form = inner(function,1)*dx
+    mean_value = float(assemble(integral_form))/space_disc.volume
+    shift(function,-mean_value)
+
+class MassProjector:
+    """L2 projection into a function space. The mass matrix is assembled and factorised once and reused by all projections."""
+    def __init__(self, function_space: FunctionSpace):
+        self.function_space = function_space
+        self.test_function = TestFunction(function_space)
+        mass_matrix = assemble( inner(TrialFunction(function_space),self.test_function)*dx )
+        self.solver = LinearSolver(mass_matrix, solver_parameters=mass_cholesky)
+
+    def __call__(self, expression) -> Function:
+        """Return the L2 projection of 'expression'."""
+        projection = Function(self.function_space)
+        self.solver.solve(projection, assemble( inner(expression,self.test_function)*dx ))
+        return projection
+
+#projectors are stored by the id of their space; the projector keeps its space alive, hence the id cannot be reused by other spaces
+_space_to_mass_projector: dict[int, MassProjector] = dict()
+
+def get_mass_projector(function_space: FunctionSpace) -> MassProjector:
+    """Return the L2 projector into 'function_space'. It is built on the first request and reused afterwards."""
+    if id(function_space) not in _space_to_mass_projector:
+        _space_to_mass_projector[id(function_space)] = MassProjector(function_space)
+    return _space_to_mass_projector[id(function_space)]
 
 def Stokes_projection(vector_field: Function, space_disc: SpaceDiscretisation) -> tuple[Function,Function]:
     """Returns a discretely divergence-free velocity (the Stokes projection of 'vector_field') and a corresponding pressure."""
@@ -16,8 +51,7 @@ def Stokes_projection(vector_field: Function, space_disc: SpaceDiscretisation) -
     solve(a == L, up, bcs=space_disc.bcs_mixed, nullspace=space_disc.null)
 
     #Mean correction
-    mean_p = Constant(assemble( inner(p,1)*dx ))
-    p.dat.data[:] = p.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+    remove_mean_value(p,space_disc)
 
     u_l2 = assemble( inner(u,u)*dx )
     u_h1 = assemble( inner(grad(u),grad(u))*dx )
@@ -41,8 +75,7 @@ def HL_projection(vector_field: Function, space_disc: SpaceDiscretisation) -> tu
     solve(a == L, up, nullspace=space_disc.null)
     
     #Mean correction
-    mean_p = Constant(assemble( inner(p,1)*dx ))
-    p.dat.data[:] = p.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+    remove_mean_value(p,space_disc)
 
     u_l2 = assemble( inner(u,u)*dx )
     u_h1 = assemble( inner(grad(u),grad(u))*dx )
@@ -67,8 +100,7 @@ def HL_projection_withBC(vector_field: Function, space_disc: SpaceDiscretisation
     solve(a == L, up, bcs=space_disc.bcs_mixed,nullspace=space_disc.null)
     
     #Mean correction
-    mean_p = Constant(assemble( inner(p,1)*dx ))
-    p.dat.data[:] = p.dat.data - Function(space_disc.pressure_space).assign(mean_p).dat.data
+    remove_mean_value(p,space_disc)
 
     u_l2 = assemble( inner(u,u)*dx )
     u_h1 = assemble( inner(grad(u),grad(u))*dx )
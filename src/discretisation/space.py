@@ -1,4 +1,5 @@
-from firedrake import MixedVectorSpaceBasis, VectorSpaceBasis, COMM_WORLD
+from firedrake import MixedVectorSpaceBasis, VectorSpaceBasis, COMM_WORLD, Constant, assemble, dx
+from functools import cached_property
 from typing import Optional
 
 from src.discretisation.mesh import MeshObject
@@ -29,12 +30,19 @@ class SpaceDiscretisation:
         self.total_dofs = self.velocity_dofs*self.velocity_space.value_size + self.pressure_dofs
 
         self.mesh = mesh_object.mesh
+        #all functions on the spaces live on the communicator of the mesh; Monte Carlo drivers use COMM_SELF to run one sample per rank
+        self.comm = self.mesh.comm
 
         self.name_bc = name_bc
         if self.name_bc:
             self.bcs_mixed, self.bcs_vel  = get_boundary_condition(self.mesh_object.name,self.name_bc,self.mixed_space,self.velocity_space)
            
-        self.null = MixedVectorSpaceBasis(self.mixed_space, [self.mixed_space.sub(0), VectorSpaceBasis(constant=True,comm=comm)])
+        self.null = MixedVectorSpaceBasis(self.mixed_space, [self.mixed_space.sub(0), VectorSpaceBasis(constant=True,comm=self.comm)])
+
+    @cached_property
+    def volume(self) -> float:
+        """Return the volume of the domain."""
+        return float(assemble(Constant(1.0)*dx(domain=self.mesh)))
 
 
     
@@ -56,9 +64,10 @@ def get_space_discretisation_from_CONFIG(name_mesh: str,
                                          pressure_element: str,
                                          pressure_degree: int,
                                          name_bc: str,
-                                         comm = COMM_WORLD) -> SpaceDiscretisation:
+                                         comm = COMM_WORLD,
+                                         reorder: bool = True) -> SpaceDiscretisation:
     """Construct a space discretisation object from CONFIGS."""
-    mesh_object = MeshObject(name_mesh=name_mesh,space_resolution=space_resolution,comm=comm)
+    mesh_object = MeshObject(name_mesh=name_mesh,space_resolution=space_resolution,comm=comm,reorder=reorder)
     velocity_disc = VelocityDiscretisation(mesh=mesh_object.mesh,element=velocity_element,degree=velocity_degree)
     pressure_disc = PressureDiscretisation(mesh=mesh_object.mesh,element=pressure_element,degree=pressure_degree)
     return SpaceDiscretisation(mesh_object=mesh_object,velocity_discretisation=velocity_disc,pressure_discretisation=pressure_disc,name_bc=name_bc,comm=comm)
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from functools import cached_property
+import numpy as np
 
 from src.string_formatting import format_header
 
@@ -11,9 +12,9 @@ def _time_steps(refinement_level: int) -> int:
     """Return number of steps based on time parameter."""
     return 2**refinement_level
 
-def _time_grid(initial_time: float, end_time: float, time_steps: int) -> list[float]:
+def _time_grid(initial_time: float, end_time: float, time_steps: int) -> np.ndarray:
     """Return time grid based on time parameter."""
-    return [initial_time + k*(end_time - initial_time)/time_steps for k in range(time_steps +1)]
+    return np.linspace(initial_time,end_time,time_steps + 1,dtype=np.float64)
 
 @dataclass
 class TimeDiscretisation:
@@ -23,7 +24,7 @@ class TimeDiscretisation:
     refinement_levels: list[int]
 
     @cached_property
-    def ref_to_time_grid(self) -> dict[int,list[float]]:
+    def ref_to_time_grid(self) -> dict[int,np.ndarray]:
          return {level: _time_grid(self.initial_time, self.end_time, _time_steps(level)) for level in self.refinement_levels }
     
     @cached_property
@@ -38,6 +39,10 @@ class TimeDiscretisation:
     def ref_to_time_to_id(self) -> dict[int,dict[float,int]]:
         return {level: {time: index for index, time in enumerate(self.ref_to_time_grid[level])} for level in self.refinement_levels}
 
+    def time_at(self, level: int, time_index: int) -> float:
+        """Return the time of the node 'time_index' of the time grid on refinement 'level'."""
+        return self.ref_to_time_grid[level][time_index]
+
     
     def __str__(self) -> str:
         out = format_header("TIME PARAMETER")
@@ -61,7 +66,12 @@ def increments_to_trajectory(initial_condition: float, increments: list[float])
 
 def trajectory_to_incremets(trajectory: list[float]) -> tuple[float,list[float]]:
     """Return initial condition and list of increments that generate the grid."""
-    increments = []
-    for index in range(len(trajectory)-1):
-        increments.append(trajectory[index + 1] - trajectory[index])
-    return trajectory[0], increments
\ No newline at end of file
+    return trajectory[0], np.diff(trajectory).tolist()
+
+def validate_increments(time_increments: list[float], noise_increments: list[float]) -> None:
+    """Raise a ValueError if deterministic and random increments are not of the same length."""
+    if not len(time_increments) == len(noise_increments):
+        msg_error = "Time grid and noise grid are not of the same length.\n"
+        msg_error += f"Time grid length: \t {len(time_increments)}\n"
+        msg_error += f"Noise grid length: \t {len(noise_increments)}"
+        raise ValueError(msg_error)
@@ -1,6 +1,9 @@
 """Defines Bochner time distances."""
+import numpy as np
 from numpy import sqrt
 from typing import Callable, TypeAlias
+from bisect import bisect_right
+from functools import lru_cache
 from firedrake import Function
 
 from src.math.distances.space import SpaceDistance
@@ -15,13 +18,28 @@ BochnerTimeDistance: TypeAlias = Callable[[dict[float,Function],dict[float,Funct
 def project_left(time: float, time_grid: list[float]) -> float:
     """Return the biggest nodal time in the time grid that is not bigger than the requested time."""
     sorted_time = sorted(time_grid)
-    if time < sorted_time[0]:
+    index = bisect_right(sorted_time,time) - 1
+    if index < 0:
         raise ValueError("Requested time is not in the time_grid.")
-    for node in sorted_time:
-        if node > time:
-            return projected_time
-        projected_time = node
-    return projected_time
+    return sorted_time[index]
+
+@lru_cache(maxsize=None)
+def _align_time_grids(sorted_time_grid1: tuple[float,...], sorted_time_grid2: tuple[float,...]) -> tuple[tuple[float,float,float],...]:
+    """Return '(union time, projected time in grid 1, projected time in grid 2)' for all nodal times of the sorted union of both time grids.
+    
+    The alignment only depends on the time grids. It is computed once and shared by all distances, processes and samples."""
+    aligned_times = []
+    for time in sorted(set(sorted_time_grid1).union(sorted_time_grid2)):
+        index1 = bisect_right(sorted_time_grid1,time) - 1
+        index2 = bisect_right(sorted_time_grid2,time) - 1
+        if index1 < 0 or index2 < 0:
+            raise ValueError("Requested time is not in the time_grid.")
+        aligned_times.append((time,sorted_time_grid1[index1],sorted_time_grid2[index2]))
+    return tuple(aligned_times)
+
+def align_time_grids(time_to_function1: dict[float, Function], time_to_function2: dict[float,Function]) -> tuple[tuple[float,float,float],...]:
+    """Return '(union time, projected time in grid 1, projected time in grid 2)' for the sorted union of the time grids of both dictionaries."""
+    return _align_time_grids(tuple(sorted(time_to_function1.keys())),tuple(sorted(time_to_function2.keys())))
 
 def integrate_in_time(time_to_function: dict[float, Function]) -> dict[float, Function]:
     sorted_time = sorted(list(time_to_function.keys()))
@@ -40,15 +58,9 @@ def linf_X_distance(time_to_function1: dict[float, Function], time_to_function2:
     Local errors on the unified time grid are computed by comparing the distance of function 1 
     and function 2 measured in 'X' at time points that are the biggest nodal times below the unified nodal time
     in time grid 1 and time grid 2, respectively. The biggest local error is returned."""
-    time_grid1 = set(time_to_function1.keys())
-    time_grid2 = set(time_to_function2.keys())
-    union_time = time_grid1.union(time_grid2)
-
-    #compute local errors and store them in a dictionary indexed by the time
+    #compute local errors
     error = []
-    for time in union_time:
-        time_projected_grid1 = project_left(time,time_grid1)
-        time_projected_grid2 = project_left(time,time_grid2)
+    for _, time_projected_grid1, time_projected_grid2 in align_time_grids(time_to_function1,time_to_function2):
         error.append(distance_X(time_to_function1[time_projected_grid1], time_to_function2[time_projected_grid2]))
     return max(error)
 
@@ -62,23 +74,15 @@ def l2_X_distance(time_to_function1: dict[float, Function], time_to_function2: d
     Afterwards the square of the local errors are weighted by increments of the unified time grid and summed up.
     Finally its square root is returned."""
 
-    time_grid1 = set(time_to_function1.keys())
-    time_grid2 = set(time_to_function2.keys())
-    union_time = time_grid1.union(time_grid2)
+    aligned_times = align_time_grids(time_to_function1,time_to_function2)
 
-    #compute local errors and store them in a dictionary indexed by the time
-    error_grid = dict()
-    for time in union_time:
-        time_projected_grid1 = project_left(time,time_grid1)
-        time_projected_grid2 = project_left(time,time_grid2)
-        error_grid[time] = distance_X(time_to_function1[time_projected_grid1], time_to_function2[time_projected_grid2])
+    #compute local errors, the initial time does not contribute to the sum and its error is not evaluated
+    error_grid = np.array([distance_X(time_to_function1[time_projected_grid1], time_to_function2[time_projected_grid2]) 
+                           for _, time_projected_grid1, time_projected_grid2 in aligned_times[1:]])
 
     #sum up the local error contributions weighted by the size of the local time steps
-    sorted_union_time = sorted(list(union_time))
-    error = 0
-    for k, time in enumerate(sorted_union_time[1:]):
-        error += error_grid[time]**2*(sorted_union_time[k+1] - sorted_union_time[k])
-    return sqrt(error)
+    sorted_union_time = [time for time, _, _ in aligned_times]
+    return sqrt(np.sum(error_grid**2*np.diff(sorted_union_time)))
 
 def end_time_X_distance(time_to_function1: dict[float, Function], time_to_function2: dict[float,Function], distance_X: SpaceDistance) -> float:
     """Computes the 'X' distance in space of 'time -> function1' and 'time -> function2' dictionaries at the endtime. """
@@ -130,15 +134,10 @@ def nikolskii_minushalf_X_distance(time_to_function1: dict[float, Function], tim
     time_to_int_function1 = integrate_in_time(time_to_function1)
     time_to_int_function2 = integrate_in_time(time_to_function2)
 
-    #generate joint time grid
-    time_grid1 = set(time_to_int_function1.keys())
-    time_grid2 = set(time_to_int_function2.keys())
-    union_time = time_grid1.union(time_grid2)
-
-    #define difference function
+    #define difference function on joint time grid
     time_to_function_dif = dict()
-    for time in union_time:
-        time_to_function_dif[time] = time_to_int_function1[project_left(time,time_grid1)] - time_to_int_function2[project_left(time,time_grid2)]
+    for time, time_projected_grid1, time_projected_grid2 in align_time_grids(time_to_int_function1,time_to_int_function2):
+        time_to_function_dif[time] = time_to_int_function1[time_projected_grid1] - time_to_int_function2[time_projected_grid2]
 
     return nikolskii_half_X_norm(time_to_function_dif,norm_X)
 
@@ -3,6 +3,7 @@ from numpy import sqrt
 from firedrake import assemble, inner, dx, Function, grad
 from typing import Callable, TypeAlias
 from src.algorithms.nonlinearities import V_tensor, V_tensor_sym
+from src.math.form_cache import are_functions, assemble_on_placeholders
 
 #############################           SPACE DISTANCE
 #abstract concept
@@ -11,22 +12,40 @@ SpaceDistance: TypeAlias = Callable[[Function,Function],float]
 #implementation
 def l2_distance(function1: Function, function2: Function) -> float:
     """Compute the L2 distance of two functions."""
+    if are_functions(function1,function2):
+        return sqrt(assemble_on_placeholders("l2_distance",[function1,function2],
+                                             lambda f1, f2: inner(f1 - f2, f1 - f2)*dx))
     return sqrt(assemble(inner(function1 - function2, function1 - function2)*dx))
 
 def h1_distance(function1: Function, function2: Function) -> float:
     """Compute the H1 distance of two functions."""
+    if are_functions(function1,function2):
+        return sqrt(assemble_on_placeholders("h1_distance",[function1,function2],
+                                             lambda f1, f2: inner(grad(f1) - grad(f2), grad(f1) - grad(f2))*dx))
     return l2_distance(grad(function1),grad(function2))
 
 ##### CARE: V distances do not follow abstract concept of distance as they require info of kappa and p
 ##### in application first use partial application (insert the value of p and kappa) to define V distance that follows abstract distanc concept
 def V_distance(function1: Function, function2: Function, kappa_value: float, p_value: float) -> float:
     """Compute the gradient V distance of two functions."""
+    if are_functions(function1,function2):
+        def build_form(f1: Function, f2: Function):
+            V1 = V_tensor(grad(f1),p_value=p_value,kappa_value=kappa_value)
+            V2 = V_tensor(grad(f2),p_value=p_value,kappa_value=kappa_value)
+            return inner(V1 - V2, V1 - V2)*dx
+        return sqrt(assemble_on_placeholders(f"V_distance_{p_value}_{kappa_value}",[function1,function2],build_form))
     V1 = V_tensor(grad(function1),p_value=p_value,kappa_value=kappa_value)
     V2 = V_tensor(grad(function2),p_value=p_value,kappa_value=kappa_value)
     return l2_distance(V1,V2)
 
 def V_sym_distance(function1: Function, function2: Function, kappa_value: float, p_value: float) -> float:
     """Compute the symmetric gradient V distance of two functions."""
+    if are_functions(function1,function2):
+        def build_form(f1: Function, f2: Function):
+            V1_sym = V_tensor_sym(grad(f1),p_value=p_value,kappa_value=kappa_value)
+            V2_sym = V_tensor_sym(grad(f2),p_value=p_value,kappa_value=kappa_value)
+            return inner(V1_sym - V2_sym, V1_sym - V2_sym)*dx
+        return sqrt(assemble_on_placeholders(f"V_sym_distance_{p_value}_{kappa_value}",[function1,function2],build_form))
     V1_sym = V_tensor_sym(grad(function1),p_value=p_value,kappa_value=kappa_value)
     V2_sym = V_tensor_sym(grad(function2),p_value=p_value,kappa_value=kappa_value)
     return l2_distance(V1_sym,V2_sym)
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""Defines pre-built forms on placeholder functions."""
+from firedrake import assemble, Function, Form
+from typing import Callable
+
+#pre-built forms are reused by all evaluations on the same function spaces, which avoids rebuilding and hashing the form in every call 
+_key_to_placeholders_and_form: dict[tuple, tuple[list[Function],Form]] = dict()
+
+def are_functions(*functions) -> bool:
+    """Return True if all arguments are functions and not general UFL expressions."""
+    return all(isinstance(function, Function) for function in functions)
+
+def assemble_on_placeholders(name: str, functions: list[Function], build_form: Callable[..., Form]) -> float:
+    """Copy the functions into placeholders and assemble the pre-built form stored for 'name' and the function spaces. 
+    If it is not available, build the form with 'build_form' and store it."""
+    key = (name, *[id(function.function_space()) for function in functions])
+    if key not in _key_to_placeholders_and_form:
+        placeholders = [Function(function.function_space()) for function in functions]
+        _key_to_placeholders_and_form[key] = (placeholders, build_form(*placeholders))
+    placeholders, form = _key_to_placeholders_and_form[key]
+    for placeholder, function in zip(placeholders, functions):
+        placeholder.assign(function)
+    return assemble(form)
@@ -1,4 +1,5 @@
 """Defines Bochner time norms."""
+import numpy as np
 from numpy import sqrt
 from firedrake import Function
 from typing import Callable, TypeAlias
@@ -25,13 +26,11 @@ def linf_X_norm(time_to_function: dict[float, Function], norm_X: SpaceNorm) -> f
 
 def l2_X_norm(time_to_function: dict[float, Function], norm_X: SpaceNorm) -> float:
     """Computes the L2 in time and 'X' in space norm of 'time -> function1' dictionary."""
-    norm_grid = {time: norm_X(time_to_function[time]) for time in time_to_function.keys()}
-    #sum up the local error contributions weighted by the size of the local time steps
     sorted_time = sorted(list(time_to_function.keys()))
-    norm = 0
-    for k, time in enumerate(sorted_time[1:]):
-        norm += norm_grid[time]**2*(sorted_time[k+1] - sorted_time[k])
-    return sqrt(norm)
+    #the initial time does not contribute to the sum and its norm is not evaluated
+    norm_grid = np.array([norm_X(time_to_function[time]) for time in sorted_time[1:]])
+    #sum up the local error contributions weighted by the size of the local time steps
+    return sqrt(np.sum(norm_grid**2*np.diff(sorted_time)))
 
 def end_time_X_norm(time_to_function: dict[float, Function], norm_X: SpaceNorm) -> float:
     """Computes the 'X' norm in space of 'time -> function1' dictionary at the endtime."""
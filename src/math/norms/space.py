@@ -3,6 +3,8 @@ from numpy import sqrt
 from firedrake import assemble, inner, dx, Function, grad, div
 from typing import Callable, TypeAlias
 
+from src.math.form_cache import are_functions, assemble_on_placeholders
+
 #############################           SPACE NORMS
 #abstract concept
 SpaceNorm: TypeAlias = Callable[[Function],float]
@@ -10,12 +12,18 @@ SpaceNorm: TypeAlias = Callable[[Function],float]
 #implementation
 def l2_space(function: Function) -> float:
     """Compute the L2 norm of a function."""
+    if are_functions(function):
+        return sqrt(assemble_on_placeholders("l2_space",[function],lambda f: inner(f,f)*dx))
     return sqrt(assemble(inner(function,function)*dx))
 
 def h1_space(function: Function) -> float:
     """Compute the H1 norm of a function."""
+    if are_functions(function):
+        return sqrt(assemble_on_placeholders("h1_space",[function],lambda f: inner(grad(f),grad(f))*dx))
     return sqrt(assemble(inner(grad(function),grad(function))*dx))
 
 def hdiv_space(function: Function) -> float:
     """Compute the L2 norm of the divergence of a vector field."""
+    if are_functions(function):
+        return sqrt(assemble_on_placeholders("hdiv_space",[function],lambda f: inner(div(f),div(f))*dx))
     return sqrt(assemble(inner(div(function),div(function))*dx))
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""Defines in-place updates of the degrees of freedom of functions."""
+from firedrake import Function
+
+#all updates act on the PETSc vectors of the functions, i.e. each update is a single compiled call without temporary arrays
+
+def shift(function: Function, value: float) -> None:
+    """Add the scalar 'value' to all degrees of freedom of 'function'."""
+    with function.dat.vec as function_vec:
+        function_vec.shift(value)
+
+def axpby(function: Function, alpha: float, beta: float, other: Function) -> None:
+    """Overwrite 'function' by 'alpha*other + beta*function'."""
+    with function.dat.vec as function_vec, other.dat.vec_ro as other_vec:
+        function_vec.axpby(alpha,beta,other_vec)
+
+def copy(function: Function, other: Function) -> None:
+    """Overwrite the degrees of freedom of 'function' by those of 'other'. Both functions need to live on the same function space."""
+    with function.dat.vec_wo as function_vec, other.dat.vec_ro as other_vec:
+        other_vec.copy(function_vec)
+
+def average(function: Function, first: Function, second: Function) -> None:
+    """Overwrite 'function' by '(first + second)/2'."""
+    with function.dat.vec_wo as function_vec, first.dat.vec_ro as first_vec, second.dat.vec_ro as second_vec:
+        function_vec.waxpy(1.0,first_vec,second_vec)
+        function_vec.scale(0.5)
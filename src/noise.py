@@ -1,6 +1,7 @@
 """Tools for generation and modification of Gaussian increments"""
 import numpy as np
 import logging
+from functools import lru_cache
 
 from typing import TypeAlias, Callable
 from src.string_formatting import format_header
@@ -9,6 +10,7 @@ from src.string_formatting import format_header
 SamplingStrategy: TypeAlias = Callable[[list[int],float,float],dict[int, np.ndarray]]
 
 ### select implementation of sampling strategy by name
+@lru_cache(maxsize=None)
 def select_sampling(noise_increments: str) -> SamplingStrategy:
     """Return requested sampling strategy."""
     msg = format_header("SAMPLING STRATEGY")
@@ -29,7 +31,7 @@ def select_sampling(noise_increments: str) -> SamplingStrategy:
 def get_WienerIncrements(N: int, tau: float) -> np.ndarray:
     '''Input: time stepsize tau, Number of intervals N 
        Output: Vector of Wiener increments'''
-    return np.concatenate( np.sqrt(tau)*np.random.randn(N,1), axis = 0)
+    return np.sqrt(tau)*np.random.randn(N)
 
 #function that generates averaged increments on a uniform time grid with size tau
 def get_WienerIncrementsAveraged(N: int, tau: float) -> np.ndarray:
@@ -57,13 +59,11 @@ def get_WienerIncrementsAveraged(N: int, tau: float) -> np.ndarray:
 def get_JointWienerIncrements(N: int, tau: float) -> tuple[np.ndarray, np.ndarray]:
     '''Input: time stepsize tau, Number of intervals N 
        Output: Vector of Wiener increments, Vector of averaged Wiener increments'''
-    dW = np.sqrt(tau)*np.random.randn(N,1)
-    z = np.sqrt(tau)*np.random.randn(N,1)
+    #draw all normal samples at once; the legacy generator yields the same stream as two consecutive draws
+    dW, z = np.sqrt(tau)*np.random.randn(2,N)
     s12 = np.sqrt(12)
     adW = (dW + np.roll(dW,1))/2 + (z - np.roll(z,1))/s12
     adW[0] = dW[0]/2 + z[0]/s12
-    dW = np.concatenate( dW, axis=0 )
-    adW = np.concatenate( adW, axis=0 )
     return dW, adW
     
 ############################################################## Coarsening #################################################    
@@ -87,7 +87,6 @@ def coarsen_WienerIncrementsAveraged(dWfine: np.ndarray, Ncoarse: int) -> np.nda
     dWtrans = dWfine.reshape(Ncoarse,ratio)
     w1 = np.linspace(1/ratio, 1,ratio) - 1/ratio
     w2 = np.flip( w1 + 1/ratio, axis= 0)
-    dWcoarse = np.zeros((Ncoarse,1))
     d1 = np.multiply(w1,dWtrans)
     d1shift = np.roll(d1,1,axis=0)
     d2 = np.multiply(w2,dWtrans)
@@ -1,3 +1,6 @@
+import matplotlib
+#plots are only written to files; the non-interactive backend needs no display
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -70,8 +70,8 @@ class DistributionChecker:
         new_measure = MeasureOnDOFs(self.measure_resolution)
         ###add data
         for seed in seed_to_velocity_new.keys():
-            old_measure.append_list_of_arrays(seed_to_velocity_old[seed].dat.data[:])
-            new_measure.append_list_of_arrays(seed_to_velocity_new[seed].dat.data[:])
+            old_measure.append_list_of_arrays(seed_to_velocity_old[seed].dat.data_ro[:])
+            new_measure.append_list_of_arrays(seed_to_velocity_new[seed].dat.data_ro[:])
         ###construct measure
         old_measure.construct_measure()
         new_measure.construct_measure()
@@ -2,9 +2,10 @@ import csv
 from firedrake import Function
 import os
 from functools import cached_property
+import numpy as np
 from numpy import ndarray
 
-from src.utils import swap_dictionary_keys
+from src.utils import swap_dictionary_keys, gather_seed_dictionary
 from src.discretisation.time import TimeDiscretisation
 from src.math.norms.stochastic import l1_stochastic, l2_stochastic, linf_stochastic
 from src.math.energy import Energy_function
@@ -38,6 +39,27 @@ class Energy(ProcessObject):
         self.seed_to_ref_to_noise_increments[self.seed_Id] = ref_to_noise_increments
         self.seed_Id += 1
 
+    def reduce(self, comm) -> None:
+        """Collect the energies and noise increments of all ranks in 'comm'."""
+        self.seed_to_ref_to_time_to_energy = gather_seed_dictionary(self.seed_to_ref_to_time_to_energy,comm)
+        self.seed_to_ref_to_noise_increments = gather_seed_dictionary(self.seed_to_ref_to_noise_increments,comm)
+        self.seed_Id = len(self.seed_to_ref_to_time_to_energy)
+        for name in ["ref_to_seed_to_time_to_energy", "ref_to_energy_array", "ref_to_seed_to_noise_increments"]:
+            self.__dict__.pop(name,None)
+
+    def state_dict(self) -> dict:
+        """Return the collected energies and noise increments."""
+        return {"seed_to_ref_to_time_to_energy": self.seed_to_ref_to_time_to_energy,
+                "seed_to_ref_to_noise_increments": self.seed_to_ref_to_noise_increments}
+
+    def load_state_dict(self, state: dict) -> None:
+        """Restore the collected energies and noise increments."""
+        self.seed_to_ref_to_time_to_energy = state["seed_to_ref_to_time_to_energy"]
+        self.seed_to_ref_to_noise_increments = state["seed_to_ref_to_noise_increments"]
+        self.seed_Id = len(self.seed_to_ref_to_time_to_energy)
+        for name in ["ref_to_seed_to_time_to_energy", "ref_to_energy_array", "ref_to_seed_to_noise_increments"]:
+            self.__dict__.pop(name,None)
+
     @cached_property
     def ref_to_seed_to_time_to_energy(self):
         if len(self.seed_to_ref_to_time_to_energy) == 0:
@@ -45,10 +67,14 @@ class Energy(ProcessObject):
         return swap_dictionary_keys(self.seed_to_ref_to_time_to_energy)
     
     @cached_property
-    def ref_to_time_to_seed_to_energy(self):
+    def ref_to_energy_array(self) -> dict[int,np.ndarray]:
+        """Return 'refinement level -> array' of shape (number of seeds, number of times). 
+        
+        The energies are stored in the order of the time grid and are accessed by time index."""
         if len(self.seed_to_ref_to_time_to_energy) == 0:
             return dict()
-        return {level: swap_dictionary_keys(self.ref_to_seed_to_time_to_energy[level]) for level in self.ref_to_seed_to_time_to_energy}
+        return {level: np.array([list(ref_to_time_to_energy[level].values()) for ref_to_time_to_energy in self.seed_to_ref_to_time_to_energy.values()])
+                for level in self.time_disc.refinement_levels}
     
     @cached_property
     def ref_to_seed_to_noise_increments(self):
@@ -58,50 +84,51 @@ class Energy(ProcessObject):
     
     @property
     def ref_to_time_to_energy_l1(self) -> dict[int,dict[float,float]]:
-        ref_to_time_to_energy = {level: {time: l1_stochastic(self.ref_to_time_to_seed_to_energy[level][time].values()) 
-                                         for time in self.time_disc.ref_to_time_grid[level]} 
-                                for level in self.ref_to_seed_to_time_to_energy}
+        ref_to_time_to_energy = {level: {self.time_disc.time_at(level,time_index): l1_stochastic(self.ref_to_energy_array[level][:,time_index]) 
+                                         for time_index in range(len(self.time_disc.ref_to_time_grid[level]))} 
+                                for level in self.ref_to_energy_array}
         return ref_to_time_to_energy
     
     @property
     def ref_to_time_to_energy_l2(self) -> dict[int,dict[float,float]]:
-        ref_to_time_to_energy = {level: {time: l2_stochastic(self.ref_to_time_to_seed_to_energy[level][time].values())
-                                         for time in self.time_disc.ref_to_time_grid[level]} 
-                                for level in self.ref_to_seed_to_time_to_energy}
+        ref_to_time_to_energy = {level: {self.time_disc.time_at(level,time_index): l2_stochastic(self.ref_to_energy_array[level][:,time_index]) 
+                                         for time_index in range(len(self.time_disc.ref_to_time_grid[level]))} 
+                                for level in self.ref_to_energy_array}
         return ref_to_time_to_energy
     
     @property
     def ref_to_time_to_energy_linf(self) -> dict[int,dict[float,float]]:
-        ref_to_time_to_energy = {level: {time: linf_stochastic(self.ref_to_time_to_seed_to_energy[level][time].values()) 
-                                         for time in self.time_disc.ref_to_time_grid[level]} 
-                                for level in self.ref_to_seed_to_time_to_energy}
+        ref_to_time_to_energy = {level: {self.time_disc.time_at(level,time_index): linf_stochastic(self.ref_to_energy_array[level][:,time_index]) 
+                                         for time_index in range(len(self.time_disc.ref_to_time_grid[level]))} 
+                                for level in self.ref_to_energy_array}
         return ref_to_time_to_energy
     
     @property
     def ref_to_time_to_energy_deviation(self) -> dict[int,dict[float,float]]:
-        ref_to_time_to_energy = {level: {time: standard_deviation(self.ref_to_time_to_seed_to_energy[level][time].values()) 
-                                         for time in self.time_disc.ref_to_time_grid[level]} 
-                                for level in self.ref_to_seed_to_time_to_energy}
+        ref_to_time_to_energy = {level: {self.time_disc.time_at(level,time_index): standard_deviation(self.ref_to_energy_array[level][:,time_index]) 
+                                         for time_index in range(len(self.time_disc.ref_to_time_grid[level]))} 
+                                for level in self.ref_to_energy_array}
         return ref_to_time_to_energy
     
     def save(self, name_directory: str) -> None:
         """Save 'time -> energy' in .csv files."""
         header = ["time","L1","L2","Linf","Standard_Deviation"]
         ref_to_data = {}
+        ref_to_time_to_energy_l1 = self.ref_to_time_to_energy_l1
+        ref_to_time_to_energy_l2 = self.ref_to_time_to_energy_l2
+        ref_to_time_to_energy_linf = self.ref_to_time_to_energy_linf
+        ref_to_time_to_energy_deviation = self.ref_to_time_to_energy_deviation
         for level in self.time_disc.refinement_levels:
-            ref_to_data[level] = [[time, 
-                                   self.ref_to_time_to_energy_l1[level][time],
-                                   self.ref_to_time_to_energy_l2[level][time],
-                                   self.ref_to_time_to_energy_linf[level][time],
-                                   self.ref_to_time_to_energy_deviation[level][time]] 
-                                   for time in self.time_disc.ref_to_time_grid[level]]
+            ref_to_data[level] = [list(row) for row in zip(self.time_disc.ref_to_time_grid[level],
+                                                            ref_to_time_to_energy_l1[level].values(),
+                                                            ref_to_time_to_energy_l2[level].values(),
+                                                            ref_to_time_to_energy_linf[level].values(),
+                                                            ref_to_time_to_energy_deviation[level].values())]
             
-        if not os.path.isdir(name_directory):
-            os.makedirs(name_directory)
+        os.makedirs(name_directory,exist_ok=True)
 
         new_dict_name = name_directory + "/" + self.energy_name 
-        if not os.path.isdir(new_dict_name):
-            os.makedirs(new_dict_name)
+        os.makedirs(new_dict_name,exist_ok=True)
 
         for level in self.time_disc.refinement_levels:
             outfile = new_dict_name + "/refinement_" + str(level) + ".csv"
@@ -112,12 +139,10 @@ class Energy(ProcessObject):
 
     def plot(self, name_directory: str) -> None:
         """Save 'time -> energy'."""
-        if not os.path.isdir(name_directory):
-            os.makedirs(name_directory)
+        os.makedirs(name_directory,exist_ok=True)
 
         new_dict_name = name_directory + "/" + self.energy_name 
-        if not os.path.isdir(new_dict_name):
-            os.makedirs(new_dict_name)
+        os.makedirs(new_dict_name,exist_ok=True)
         plot_ref_to_time_to_function({self.energy_name + "_L1": self.ref_to_time_to_energy_l1, 
                                       self.energy_name + "_Deviation": self.ref_to_time_to_energy_deviation},new_dict_name + "/L1.png",["log","log"])
         plot_ref_to_time_to_function({self.energy_name + "_L2": self.ref_to_time_to_energy_l2, 
@@ -126,12 +151,10 @@ class Energy(ProcessObject):
                                       self.energy_name + "_Deviation": self.ref_to_time_to_energy_deviation},new_dict_name + "/Linf.png",["log","log"])
     """       
     def plot_individual(self, name_directory: str) -> None:
-        if not os.path.isdir(name_directory):
-            os.makedirs(name_directory)
+        os.makedirs(name_directory,exist_ok=True)
 
         new_dict_name = name_directory + "/" + self.energy_name 
-        if not os.path.isdir(new_dict_name):
-            os.makedirs(new_dict_name)
+        os.makedirs(new_dict_name,exist_ok=True)
 
         for level in self.ref_to_seed_to_time_to_energy.keys():
             plot_seed_to_time_to_number(self.ref_to_seed_to_time_to_energy[level],new_dict_name + "/level_" + str(level) + ".png","level " + str(level),"log")
@@ -139,12 +162,10 @@ class Energy(ProcessObject):
 
     def plot_individual(self, name_directory: str) -> None:
         """Save 'time -> energy'."""
-        if not os.path.isdir(name_directory):
-            os.makedirs(name_directory)
+        os.makedirs(name_directory,exist_ok=True)
 
         new_dict_name = name_directory + "/" + self.energy_name 
-        if not os.path.isdir(new_dict_name):
-            os.makedirs(new_dict_name)
+        os.makedirs(new_dict_name,exist_ok=True)
 
         for level in self.ref_to_seed_to_time_to_energy.keys():
             plot_seed_to_time_to_number_and_increments(self.ref_to_seed_to_time_to_energy[level],
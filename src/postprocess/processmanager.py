@@ -5,6 +5,18 @@ class ProcessObject(Protocol):
         print("update is not implemented.")
         return
     
+    def reduce(self,*args,**kwargs) -> None:
+        print("reduce is not implemented.")
+        return
+
+    def state_dict(self) -> dict:
+        print("state_dict is not implemented.")
+        return dict()
+
+    def load_state_dict(self, state: dict) -> None:
+        print("load_state_dict is not implemented.")
+        return
+
     def save(self,*args,**kwargs) -> None:
         print("save is not implemented.")
         return
@@ -32,6 +44,17 @@ class ProcessManager:
         for process_object in self.list_of_process_objects:
             process_object.update(*args,**kwargs)
 
+    def reduce(self,*args,**kwargs) -> None:
+        for process_object in self.list_of_process_objects:
+            process_object.reduce(*args,**kwargs)
+
+    def state_dict(self) -> list[dict]:
+        return [process_object.state_dict() for process_object in self.list_of_process_objects]
+
+    def load_state_dict(self, states: list[dict]) -> None:
+        for process_object, state in zip(self.list_of_process_objects,states):
+            process_object.load_state_dict(state)
+
     def save(self,*args,**kwargs) -> None:
         for process_object in self.list_of_process_objects:
             process_object.save(*args,**kwargs)
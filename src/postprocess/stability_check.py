@@ -3,7 +3,7 @@ import csv
 import os
 from functools import cached_property
 
-from src.utils import swap_dictionary_keys
+from src.utils import swap_dictionary_keys, gather_seed_dictionary
 from src.math.norms.stochastic import l1_stochastic, l2_stochastic, linf_stochastic
 from src.math.norms.Bochner_time import BochnerTimeNorm
 from src.math.norms.space import SpaceNorm
@@ -41,6 +41,22 @@ class StabilityCheck(ProcessObject):
         self.seed_to_ref_to_norm[self.seed_Id] = _evaluate_norm(ref_to_time_to_function,self.bochner_time_norm,self.space_norm)
         self.seed_Id += 1
 
+    def reduce(self, comm) -> None:
+        """Collect the norms of all ranks in 'comm'."""
+        self.seed_to_ref_to_norm = gather_seed_dictionary(self.seed_to_ref_to_norm,comm)
+        self.seed_Id = len(self.seed_to_ref_to_norm)
+        self.__dict__.pop("ref_to_seed_to_norm",None)
+
+    def state_dict(self) -> dict:
+        """Return the collected norms."""
+        return {"seed_to_ref_to_norm": self.seed_to_ref_to_norm}
+
+    def load_state_dict(self, state: dict) -> None:
+        """Restore the collected norms."""
+        self.seed_to_ref_to_norm = state["seed_to_ref_to_norm"]
+        self.seed_Id = len(self.seed_to_ref_to_norm)
+        self.__dict__.pop("ref_to_seed_to_norm",None)
+
     @cached_property
     def ref_to_seed_to_norm(self):
         if len(self.seed_to_ref_to_norm) == 0:
@@ -84,8 +100,7 @@ class StabilityCheck(ProcessObject):
                          self.ref_to_norm_l2[level], self.ref_to_EOC_l2[level],
                          self.ref_to_norm_linf[level],self.ref_to_EOC_linf[level],
                          self.ref_to_norm_deviation[level]])
-        if not os.path.isdir(name_directory):
-            os.makedirs(name_directory)
+        os.makedirs(name_directory,exist_ok=True)
 
         outfile = name_directory + "/" + self.norm_name + ".csv"
         with open(outfile,"w",newline="") as file:
@@ -2,80 +2,101 @@ import numpy as np
 import os
 import shutil
 from firedrake import FunctionSpace, Function
+from mpi4py import MPI
 
 from src.vtk_saver import save_function_as_VTK
+from src.solution_trace import SolutionTrace
 
 
-def _update_mean(samples: int, old_mean_matrix: np.ndarray, update_matrix: np.ndarray) -> np.ndarray:
-    """Update the mean value."""
-    if not old_mean_matrix.shape == update_matrix.shape:
-        msg = "Shape of mean array und update array do not match."
-        msg += f"\nShape mean array:\t {old_mean_matrix.shape}"
-        msg += f"\nShape update array:\t {update_matrix.shape}"
-        raise ValueError(msg)
-    return samples/(samples + 1)*old_mean_matrix + 1/(samples+1)*update_matrix
-
-def _update_square(samples: int, old_square_matrix: np.ndarray, update_matrix: np.ndarray) -> np.ndarray:
-    """Update the normalised second moment."""
-    if not old_square_matrix.shape == update_matrix.shape:
-        msg = "Shape of mean array und update array do not match."
-        msg += f"\nShape mean array:\t {old_square_matrix.shape}"
-        msg += f"\nShape update array:\t {update_matrix.shape}"
-        raise ValueError(msg)
-    return samples/(samples + 1)*old_square_matrix + 1/(samples+1)*np.power(update_matrix,2)
-
+def _array_to_function(array: np.ndarray, function_space: FunctionSpace) -> Function:
+    """Return function in 'function_space' whose degrees of freedom are given by 'array'."""
+    function = Function(function_space)
+    function.dat.data[:] = array
+    return function
 
 
 class StatisticsObject:
-    """Class that contains utilities for the computation of mean, second moment, and deviation of 'ref -> time -> function' dictionary."""
+    """Class that contains utilities for the computation of mean, second moment, and deviation of 'ref -> time -> function' dictionary.
+
+    Running sums of the samples and their squares are stored as 'refinement level -> array' of shape (number of times, shape of dofs)."""
     def __init__(self, name: str, ref_to_time_grid: dict[int,list[float]], function_space: FunctionSpace):
         self.name = name
         self.function_space = function_space
         self.ref_to_time_grid = ref_to_time_grid
-        self.ref_to_time_to_function_mean = {level: {time: Function(function_space) for time in ref_to_time_grid[level]} for level in ref_to_time_grid.keys()}
-        self.ref_to_time_to_function_square = {level: {time: Function(function_space) for time in ref_to_time_grid[level]} for level in ref_to_time_grid.keys()}
+        dof_shape = Function(function_space).dat.data_ro.shape
+        self.ref_to_sum = {level: np.zeros((len(ref_to_time_grid[level]),*dof_shape)) for level in ref_to_time_grid.keys()}
+        self.ref_to_square_sum = {level: np.zeros((len(ref_to_time_grid[level]),*dof_shape)) for level in ref_to_time_grid.keys()}
+        #scratch array for squared samples, levels only differ in the number of times and use a view of it
+        self._buffer = np.zeros((max(len(time_grid) for time_grid in ref_to_time_grid.values()),*dof_shape))
         self.samples = 0
-        
-
-    def update(self,ref_to_time_to_function) -> None:
-        """Add a sample to mean and second moment."""
-        for level in self.ref_to_time_to_function_mean.keys():
-            for time in self.ref_to_time_to_function_mean[level].keys():
-                #update mean
-                self.ref_to_time_to_function_mean[level][time].dat.data[:] = _update_mean(self.samples,
-                                                                                       self.ref_to_time_to_function_mean[level][time].dat.data,
-                                                                                       ref_to_time_to_function[level][time].dat.data)
-                #update square
-                self.ref_to_time_to_function_square[level][time].dat.data[:] = _update_square(self.samples,
-                                                                                       self.ref_to_time_to_function_square[level][time].dat.data,
-                                                                                       ref_to_time_to_function[level][time].dat.data)
+
+
+    def update(self, solution_trace: SolutionTrace) -> None:
+        """Add a sample to the running sums."""
+        for level in self.ref_to_sum.keys():
+            data = solution_trace.u[level]
+            if not data.shape == self.ref_to_sum[level].shape:
+                msg = "Shape of running sum and sample do not match."
+                msg += f"\nShape running sum:\t {self.ref_to_sum[level].shape}"
+                msg += f"\nShape sample:\t {data.shape}"
+                raise ValueError(msg)
+            buffer = self._buffer[:data.shape[0]]
+            np.add(self.ref_to_sum[level],data,out=self.ref_to_sum[level])
+            np.multiply(data,data,out=buffer)
+            np.add(self.ref_to_square_sum[level],buffer,out=self.ref_to_square_sum[level])
         self.samples += 1
-    
+
+    def reduce(self, comm) -> None:
+        """Combine the running sums of all ranks in 'comm'."""
+        self.samples = comm.allreduce(self.samples,op=MPI.SUM)
+        for ref_to_running_sum in [self.ref_to_sum, self.ref_to_square_sum]:
+            for level in ref_to_running_sum.keys():
+                comm.Allreduce(MPI.IN_PLACE,ref_to_running_sum[level],op=MPI.SUM)
+
+    def state_dict(self) -> dict:
+        """Return the number of samples and the running sums."""
+        return {"samples": self.samples, "ref_to_sum": self.ref_to_sum, "ref_to_square_sum": self.ref_to_square_sum}
+
+    def load_state_dict(self, state: dict) -> None:
+        """Restore the number of samples and the running sums."""
+        self.samples = state["samples"]
+        for level in self.ref_to_sum.keys():
+            self.ref_to_sum[level][:] = state["ref_to_sum"][level]
+            self.ref_to_square_sum[level][:] = state["ref_to_square_sum"][level]
+
+    @property
+    def ref_to_time_to_function_mean(self) -> dict[int,dict[float,Function]]:
+        """Compute the mean value based on the running sum."""
+        return {level: {time: _array_to_function(self.ref_to_sum[level][time_index]/self.samples,self.function_space)
+                        for time_index, time in enumerate(self.ref_to_time_grid[level])}
+                for level in self.ref_to_sum.keys()}
+
     @property
     def ref_to_time_to_function_deviation(self) -> dict[int,dict[float,Function]]:
-        """Compute the standard deviation based on mean and second moment."""
-        ref_to_time_to_function_dev = {level: {time: Function(self.function_space) for time in self.ref_to_time_grid[level]} for level in self.ref_to_time_grid.keys()}
-        for level in self.ref_to_time_to_function_mean.keys():
-            for time in self.ref_to_time_to_function_mean[level].keys():
-                #Analytically the deviation is always non-negative and there is no issue to take the square root. 
-                #But numerically it might happen that the deviation is negative, leading to difficulties. We avoid this by first truncating negative values to 0.
-                dev = self.ref_to_time_to_function_square[level][time].dat.data - np.power(self.ref_to_time_to_function_mean[level][time].dat.data,2)
-                zeros = np.zeros(dev.shape)
-                dev_zeros = np.maximum(dev,zeros)
-                ref_to_time_to_function_dev[level][time].dat.data[:] = np.sqrt(dev_zeros)
+        """Compute the standard deviation based on the running sums."""
+        ref_to_time_to_function_dev = dict()
+        for level in self.ref_to_sum.keys():
+            #Analytically the deviation is always non-negative and there is no issue to take the square root.
+            #But numerically it might happen that the deviation is negative, leading to difficulties. We avoid this by first truncating negative values to 0.
+            dev = self.ref_to_square_sum[level]/self.samples - np.power(self.ref_to_sum[level]/self.samples,2)
+            dev_zeros = np.maximum(dev,0)
+            ref_to_time_to_function_dev[level] = {time: _array_to_function(np.sqrt(dev_zeros[time_index]),self.function_space)
+                                                  for time_index, time in enumerate(self.ref_to_time_grid[level])}
         return ref_to_time_to_function_dev
 
     def _save_mean(self, name_directory: str) -> None:
         """Save the mean value in vtk format."""
-        for level in self.ref_to_time_to_function_mean.keys():
+        ref_to_time_to_function_mean = self.ref_to_time_to_function_mean
+        for level in ref_to_time_to_function_mean.keys():
             outfile_name = name_directory + "/refinement_" + str(level) + "/mean.pvd"
-            save_function_as_VTK(outfile_name,self.name + "_mean",self.ref_to_time_to_function_mean[level])
+            save_function_as_VTK(outfile_name,self.name + "_mean",ref_to_time_to_function_mean[level])
 
     def _save_deviation(self, name_directory: str) -> None:
         """Save the mean value in vtk format."""
-        for level in self.ref_to_time_to_function_mean.keys():
+        ref_to_time_to_function_deviation = self.ref_to_time_to_function_deviation
+        for level in ref_to_time_to_function_deviation.keys():
             outfile_name = name_directory + "/refinement_" + str(level) + "/deviation.pvd"
-            save_function_as_VTK(outfile_name,self.name + "_dev",self.ref_to_time_to_function_deviation[level])
+            save_function_as_VTK(outfile_name,self.name + "_dev",ref_to_time_to_function_deviation[level])
 
     def save(self,name_directory: str) -> None:
         """Save mean and standard deviation in vtk format."""
@@ -84,4 +105,4 @@ class StatisticsObject:
         if os.path.isdir(save_directory):
                 shutil.rmtree("./" + save_directory)
         self._save_mean(save_directory)
-        self._save_deviation(save_directory)
\ No newline at end of file
+        self._save_deviation(save_directory)
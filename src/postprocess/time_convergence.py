@@ -3,7 +3,7 @@ import csv
 import os
 from functools import cached_property
 
-from src.utils import swap_dictionary_keys
+from src.utils import swap_dictionary_keys, gather_seed_dictionary
 from src.math.norms.stochastic import l1_stochastic, l2_stochastic, linf_stochastic
 from src.math.statistics import standard_deviation
 from src.math.distances.Bochner_time import BochnerTimeDistance
@@ -29,9 +29,12 @@ def _compare_coarse_and_fine_on_Y_X_relative(ref_to_time_to_coarse: dict[int,dic
     Rescale error by Y-X norm of fine approximation.
     
     Return 'refinement level -> error' dictionary."""
-    time_to_zero = {time: Function(time_to_fine[time].function_space()) for time in time_to_fine}
+    #the norm of the fine approximation is shared by all levels and is computed once
+    zero = Function(next(iter(time_to_fine.values())).function_space())
+    time_to_zero = {time: zero for time in time_to_fine}
+    fine_norm = Y_time_distance(time_to_fine,time_to_zero,X_space_distance)
 
-    return {level: Y_time_distance(ref_to_time_to_coarse[level],time_to_fine,X_space_distance)/Y_time_distance(time_to_fine,time_to_zero,X_space_distance) 
+    return {level: Y_time_distance(ref_to_time_to_coarse[level],time_to_fine,X_space_distance)/fine_norm 
             for level in ref_to_time_to_coarse.keys()}
 
 
@@ -62,6 +65,22 @@ class TimeComparison(ProcessObject):
                 raise NotImplementedError
         self.seed_Id += 1
 
+    def reduce(self, comm) -> None:
+        """Collect the errors of all ranks in 'comm'."""
+        self.seed_to_ref_to_error = gather_seed_dictionary(self.seed_to_ref_to_error,comm)
+        self.seed_Id = len(self.seed_to_ref_to_error)
+        self.__dict__.pop("ref_to_seed_to_error",None)
+
+    def state_dict(self) -> dict:
+        """Return the collected errors."""
+        return {"seed_to_ref_to_error": self.seed_to_ref_to_error}
+
+    def load_state_dict(self, state: dict) -> None:
+        """Restore the collected errors."""
+        self.seed_to_ref_to_error = state["seed_to_ref_to_error"]
+        self.seed_Id = len(self.seed_to_ref_to_error)
+        self.__dict__.pop("ref_to_seed_to_error",None)
+
     @cached_property
     def ref_to_seed_to_error(self):
         if len(self.seed_to_ref_to_error) == 0:
@@ -105,8 +124,7 @@ class TimeComparison(ProcessObject):
                          self.ref_to_error_l2[level], self.ref_to_EOC_l2[level],
                          self.ref_to_error_linf[level],self.ref_to_EOC_linf[level],
                          self.ref_to_error_deviation[level]])
-        if not os.path.isdir(name_directory):
-            os.makedirs(name_directory)
+        os.makedirs(name_directory,exist_ok=True)
 
         outfile = name_directory + "/" + self.error_name + ".csv"
         with open(outfile,"w",newline="") as file:
@@ -1,8 +1,9 @@
 from firedrake import *
 from typing import TypeAlias, Callable, Any
+from functools import wraps
 
 from src.discretisation.space import SpaceDiscretisation
-from src.discretisation.projections import Stokes_projection, HL_projection, HL_projection_withBC
+from src.discretisation.projections import Stokes_projection, HL_projection, HL_projection_withBC, get_mass_projector
 
 
 ### Converter that maps string representation of functions to its implementation
@@ -69,35 +70,54 @@ def get_function(name_requested_function: str, space_disc: SpaceDiscretisation,
 ### abstract concept
 FunctionGenerator: TypeAlias = Callable[[Any],Function]
 
+### memoisation
+#projections are stored by generator and arguments, meshes and spaces are identified by their id; 
+#the stored functions keep their spaces alive, hence the ids cannot be reused by other objects
+_key_to_projection: dict[tuple, Function] = dict()
+
+def _memoised(generator: FunctionGenerator) -> FunctionGenerator:
+    """Return generator that computes the projection once per arguments. Callers receive copies, since functions are mutable."""
+    @wraps(generator)
+    def memoised_generator(**kwargs) -> Function:
+        key = (generator.__name__, *sorted((name, value if isinstance(value,int) else id(value)) for name, value in kwargs.items()))
+        if key not in _key_to_projection:
+            _key_to_projection[key] = generator(**kwargs)
+        return _key_to_projection[key].copy(deepcopy=True)
+    return memoised_generator
+
 ### implementation
 
 #see Section 6 in 'Time-splitting Methods to solve the stochastic incrompressible Stokes equation'
+@_memoised
 def _non_solenoidal(j: int, k: int, mesh: MeshGeometry, velocity_space: FunctionSpace) -> Function:
     x, y = SpatialCoordinate(mesh)
     expr = as_vector([
         sin(j*pi*x)*sin(k*pi*y),
         sin(j*pi*x)*sin(k*pi*y)
         ])
-    return project(expr, velocity_space)
+    return get_mass_projector(velocity_space)(expr)
 
 #see Section 6 in 'Time-splitting Methods to solve the stochastic incrompressible Stokes equation'
+@_memoised
 def _solenoidal(j: int, k: int, mesh: MeshGeometry, velocity_space: FunctionSpace) -> Function:
     x, y = SpatialCoordinate(mesh)
     expr = as_vector([
         -1.0*cos(j*pi*x - pi/2.0)*sin(k*pi*y - pi/2.0),
         sin(j*pi*x - pi/2.0)*cos(k*pi*y - pi/2.0)
         ])
-    return project(expr, velocity_space)
+    return get_mass_projector(velocity_space)(expr)
 
+@_memoised
 def _hill_wave(mesh: MeshGeometry, velocity_space: FunctionSpace) -> Function:
     x, y = SpatialCoordinate(mesh)
     expr = as_vector([
         sin(pi*x)*sin(pi*y),
         sin(2*pi*x)*sin(2*pi*y)
         ])
-    return project(expr, velocity_space)
+    return get_mass_projector(velocity_space)(expr)
 
 #exactly divergence-free and vanishes on the boundary of the unit square
+@_memoised
 def _polynomial(mesh: MeshGeometry, velocity_space: FunctionSpace) -> Function:
     x, y = SpatialCoordinate(mesh)
     scaling: float = 1.0
@@ -105,8 +125,9 @@ def _polynomial(mesh: MeshGeometry, velocity_space: FunctionSpace) -> Function:
         scaling*(x*x*(1-x)*(1-x)*(2-6*y+4*y*y)*y),
         scaling*(-y*y*(1-y)*(1-y)*(2-6*x+4*x*x)*x)
         ])
-    return project(expr, velocity_space)
+    return get_mass_projector(velocity_space)(expr)
 
+@_memoised
 def _polynomial_non_bc(mesh: MeshGeometry, velocity_space: FunctionSpace) -> Function:
     x, y = SpatialCoordinate(mesh)
     scaling: float = 1.0
@@ -114,8 +135,9 @@ def _polynomial_non_bc(mesh: MeshGeometry, velocity_space: FunctionSpace) -> Fun
         scaling*(x*x*(1-x)*(1-x)*(2-6*y+4*y*y)*y + 1),
         scaling*(-y*y*(1-y)*(1-y)*(2-6*x+4*x*x)*x + 1)
         ])
-    return project(expr, velocity_space)
+    return get_mass_projector(velocity_space)(expr)
 
+@_memoised
 def _polynomial_non_div(mesh: MeshGeometry, velocity_space: FunctionSpace) -> Function:
     x, y = SpatialCoordinate(mesh)
     scaling: float = 1.0
@@ -123,7 +145,7 @@ def _polynomial_non_div(mesh: MeshGeometry, velocity_space: FunctionSpace) -> Fu
         scaling*(x*x*(1-x)*(1-x)*(2-6*y+4*y*y)*y + x*(1-x)*y*(1-y)),
         scaling*(-y*y*(1-y)*(1-y)*(2-6*x+4*x*x)*x + x*(1-x)*y*(1-y))
         ])
-    return project(expr, velocity_space)
+    return get_mass_projector(velocity_space)(expr)
 
 
         
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+import numpy as np
+from firedrake import Function
+
+@dataclass
+class SolutionTrace:
+    """Degrees of freedom of a 'refinement level -> time -> function' dictionary stored as struct of arrays.
+
+    For each refinement level the nodal times are stored in 'grids[level]' and the degrees of freedom in 'u[level]',
+    an array of shape (number of times, shape of dofs)."""
+    levels: list[int]
+    grids: dict[int,np.ndarray]
+    u: dict[int,np.ndarray]
+
+    @classmethod
+    def from_ref_to_time_to_function(cls, ref_to_time_to_function: dict[int,dict[float,Function]]) -> "SolutionTrace":
+        """Return the trace of a 'refinement level -> time -> function' dictionary."""
+        levels = list(ref_to_time_to_function.keys())
+        grids = {level: np.fromiter(ref_to_time_to_function[level].keys(),dtype=float) for level in levels}
+        #the read-only views of all times are copied into one contiguous array by a single call
+        u = {level: np.stack([function.dat.data_ro for function in ref_to_time_to_function[level].values()]) for level in levels}
+        return cls(levels,grids,u)
@@ -35,6 +35,13 @@ def swap_dictionary_keys(key1_to_key2_to_value: dict[Keys1,dict[Keys2, Values]])
             
     return key2_to_key1_to_value
 
+def gather_seed_dictionary(seed_to_value: dict[int,Values], comm) -> dict[int,Values]:
+    """Gather the 'seed -> value' dictionaries of all ranks in 'comm'.
+    
+    The seeds are renumbered consecutively in the order of the ranks."""
+    values = [value for rank_seed_to_value in comm.allgather(seed_to_value) for value in rank_seed_to_value.values()]
+    return {seed_Id: value for seed_Id, value in enumerate(values)}
+
 def logstring_to_logger(loglevel: str):
     match loglevel:
         case "debug":